@@ -0,0 +1,52 @@
+"""
+Benchmark for decoding Submission pages with each installed JSON decoder.
+Uses a synthetic ``MAX_API_COUNT``-item page by default; pass paths of
+recorded API responses to decode those instead.
+
+Run from the repository root::
+
+    python benchmarks/decoding.py [page.json ...]
+
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from submittable_api_client.decoders import (  # noqa
+    available_decoders, get_decoder,
+)
+from provisioning import page_content  # noqa
+
+
+def fixtures(paths):
+    """ Page bodies to decode, keyed by name. """
+    if not paths:
+        return [('synthetic page', page_content())]
+    pages = []
+    for path in paths:
+        with open(path, 'rb') as page_file:
+            pages.append((os.path.basename(path), page_file.read()))
+    return pages
+
+
+def bench(loads, content, number):
+    return min(timeit.repeat(
+        lambda: loads(content), number=number, repeat=5)) / number
+
+
+def main(paths=None, number=50):
+    names = available_decoders()
+    for label, content in fixtures(paths):
+        print("%s (%d KB)" % (label, len(content) // 1024))
+        timings = [(name, bench(get_decoder(name), content, number))
+                   for name in names]
+        baseline = dict(timings)['json']
+        for name, seconds in timings:
+            print("  %-10s %8.3f ms/page  %5.2fx" % (
+                name, seconds * 1000, baseline / seconds))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
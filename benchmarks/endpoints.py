@@ -0,0 +1,137 @@
+"""
+End-to-end benchmark of the client against the local mock server in
+``mock_server.py``. For each endpoint it reports throughput, per-call
+latency percentiles, the CPU time spent decoding and building objects, and
+peak memory (Python 3 only).
+
+Run from the repository root::
+
+    python benchmarks/endpoints.py [--calls 200] [--latency 20]
+        [--page-size 200] [--concurrency 8] [--endpoint submissions]
+
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from submittable_api_client import submittable_api_client as api  # noqa
+from mock_server import TOTAL_SUBMISSIONS, MockAPIServer  # noqa
+
+try:
+    import tracemalloc
+except ImportError:  # Python 2
+    tracemalloc = None
+
+
+def scenarios(page_size):
+    """ Endpoint name and a function making the ``index``-th call. """
+    pages = -(-TOTAL_SUBMISSIONS // page_size)
+    return (
+        ('categories', lambda client, index: client.categories()),
+        ('submissions', lambda client, index: client.submissions(
+            page=index % pages + 1, per_page=page_size, status='all')),
+        ('submission_form', lambda client, index: client.submission_form(
+            sub_id=index + 1)),
+        ('payments', lambda client, index: client.payments(
+            year=2014, month=index % 12 + 1)),
+        ('submission_file', lambda client, index: client.submission_file(
+            sub_id=index + 1, file_guid='guid%s' % index).content),
+    )
+
+
+def percentile(values, fraction):
+    """ Value below which ``fraction`` of the sorted ``values`` fall. """
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def calls_made(client, call, calls, concurrency):
+    """ Make ``calls`` calls, dropping results as a streaming job would. """
+    for _ in api._bounded_map(
+            lambda index: call(client, index), range(calls), concurrency,
+            ordered=False):
+        pass
+
+
+def run(client, call, calls, concurrency):
+    """
+    Make ``calls`` calls and return the events, elapsed seconds and peak
+    memory. Memory is traced in a second pass, as tracing slows the calls.
+    """
+    events = []
+    client.hooks = [events.append]
+    gc.collect()
+    started = time.time()
+    calls_made(client, call, calls, concurrency)
+    elapsed = time.time() - started
+    client.hooks = []
+
+    peak = None
+    if tracemalloc:
+        gc.collect()
+        tracemalloc.start()
+        calls_made(client, call, calls, concurrency)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return events, elapsed, peak
+
+
+def report(name, events, elapsed, peak):
+    latencies = sorted(event.total for event in events)
+    cpu = sum(event.decode + event.provision for event in events)
+    print("%-16s %8.1f/s %8.2f %8.2f %8.2f %10.3f %10s" % (
+        name,
+        len(events) / elapsed,
+        percentile(latencies, 0.5) * 1000,
+        percentile(latencies, 0.9) * 1000,
+        percentile(latencies, 0.99) * 1000,
+        cpu / max(len(events), 1) * 1000,
+        '%.1f MB' % (peak / 1048576.0) if peak is not None else '-',
+    ))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--calls', type=int, default=200,
+                        help='calls per endpoint')
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='server delay per response, in milliseconds')
+    parser.add_argument('--page-size', type=int, default=api.MAX_API_COUNT,
+                        help='submissions per page')
+    parser.add_argument('--concurrency', type=int, default=1,
+                        help='calls in flight at once')
+    parser.add_argument('--endpoint', action='append',
+                        help='only benchmark this endpoint (repeatable)')
+    args = parser.parse_args(argv)
+
+    server = MockAPIServer(latency=args.latency / 1000)
+    base_uri = api.BASE_API_URI
+    api.BASE_API_URI = server.start()
+    client = api.SubmittableAPIClient(
+        username='benchmark', apitoken='benchmark',
+        pool_maxsize=max(args.concurrency, api.DEFAULT_POOL_MAXSIZE))
+    try:
+        print("%d calls per endpoint, %s ms latency, concurrency %d" % (
+            args.calls, args.latency, args.concurrency))
+        print("%-16s %10s %8s %8s %8s %10s %10s" % (
+            'endpoint', 'calls/s', 'p50 ms', 'p90 ms', 'p99 ms', 'cpu ms',
+            'peak'))
+        for name, call in scenarios(args.page_size):
+            if args.endpoint and name not in args.endpoint:
+                continue
+            # Warm up the connection pool and the server's response cache.
+            call(client, 0)
+            report(name, *run(client, call, args.calls, args.concurrency))
+    finally:
+        client.close()
+        server.shutdown()
+        api.BASE_API_URI = base_uri
+
+
+if __name__ == '__main__':
+    main()
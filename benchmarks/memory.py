@@ -0,0 +1,65 @@
+"""
+Memory benchmark for holding a large archive of Submission objects in
+memory. Builds a synthetic dataset of decoded submission dictionaries and
+reports the memory taken by the model objects built from it.
+
+Run from the repository root::
+
+    python benchmarks/memory.py [count]
+
+"""
+from datetime import datetime, timedelta
+import gc
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from submittable_api_client import submittable_api_client as api  # noqa
+from provisioning import submission_data  # noqa
+
+try:
+    import tracemalloc
+except ImportError:  # Python 2
+    tracemalloc = None
+
+
+def dataset(count):
+    """ Decoded submission dictionaries, as if read from the API. """
+    start = datetime(2014, 5, 1, 9, 0, 0)
+    raw = json.dumps([
+        submission_data(index, (start + timedelta(minutes=index)).strftime(
+            api.TIMESTAMP_FORMAT))
+        for index in range(count)
+    ])
+    return json.loads(raw)
+
+
+def measure(build):
+    """ Return (result, bytes allocated by build()). """
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def main(count=100000):
+    if tracemalloc is None:
+        print("This benchmark requires Python 3.4+ (tracemalloc).")
+        return
+    data = dataset(count)
+    print("%s synthetic submissions" % count)
+    for item_class in (api.Submission, api.LazySubmission):
+        objects, size = measure(
+            lambda: [item_class(item) for item in data])
+        print("%-16s %8.1f MB  %6d bytes/submission" % (
+            item_class.__name__, size / 1048576.0, size // count))
+        del objects
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,153 @@
+"""
+A local stand-in for the Submittable API used by the benchmarks. Serves
+synthetic ``categories``, ``submissions``, ``submissions/<id>/form``,
+``payments`` and file endpoints, with an optional delay before every
+response to simulate network latency.
+
+Start it on its own with::
+
+    python benchmarks/mock_server.py [port] [latency_ms]
+
+"""
+import json
+import os
+import re
+import sys
+import threading
+import time
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+    from urllib.parse import parse_qs, urlparse
+except ImportError:  # Python 2
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+    from urlparse import parse_qs, urlparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from submittable_api_client import submittable_api_client as api  # noqa
+from provisioning import submission_data  # noqa
+
+TOTAL_SUBMISSIONS = 5000
+FILE_SIZE = 256 * 1024
+DATE = "2014-05-21T11:58:57"
+
+
+def form_data(sub_id, fields=20):
+    """ A submitted form with ``fields`` answered questions. """
+    return {'type': 'form', 'url': '', 'count': fields, 'items': [
+        {'label': 'Question %s' % index,
+         'data': 'Answer %s for submission %s. ' % (index, sub_id) * 10,
+         'blind': False, 'order': index}
+        for index in range(fields)]}
+
+
+def payment_data(index):
+    return {'payment_id': index, 'submission_id': index, 'category_id': 1,
+            'amount': 3.0, 'fee': 0.5, 'payment_date': DATE,
+            'refunded': False, 'settled': True,
+            'submitter': {'user_id': index % 50}}
+
+
+def route(path, query):
+    """ Return the JSON data for an API path, or None if it is unknown. """
+    match = re.match(r'^submissions/(\d+)/form$', path)
+    if match:
+        return form_data(int(match.group(1)))
+    if path == 'submissions/':
+        page = int(query.get('page', ['1'])[0])
+        count = min(int(query.get('count', ['20'])[0]), api.MAX_API_COUNT)
+        first = (page - 1) * count
+        last = min(first + count, TOTAL_SUBMISSIONS)
+        return {
+            'current_page': page,
+            'total_pages': -(-TOTAL_SUBMISSIONS // count),
+            'total_items': TOTAL_SUBMISSIONS, 'items_per_page': count,
+            'count': max(last - first, 0),
+            'items': [submission_data(index, DATE)
+                      for index in range(first, last)],
+        }
+    if re.match(r'^submissions/(\d+)$', path):
+        return submission_data(int(path.split('/')[1]), DATE)
+    if re.match(r'^payments/\d+/\d+$', path):
+        return {'items': [payment_data(index) for index in range(100)]}
+    if path == 'categories/':
+        return {'items': [
+            {'category_id': index, 'name': 'Category %s' % index,
+             'active': True, 'form_url': ''}
+            for index in range(25)]}
+    return None
+
+
+class MockAPIHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are written separately; without this, Nagle's
+    # algorithm adds ~40ms to every kept-alive response.
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        parsed = urlparse(self.path)
+        path = parsed.path[len('/v1/'):]
+        if re.match(r'^submissions/\d+/file/\w+$', path):
+            body = self.server.file_body
+            content_type = 'application/octet-stream'
+        else:
+            body = self.server.bodies.get(self.path)
+            if body is None:
+                data = route(path, parse_qs(parsed.query))
+                if data is None:
+                    self.send_error(404)
+                    return
+                body = json.dumps(data).encode('utf-8')
+                self.server.bodies[self.path] = body
+            content_type = 'application/json'
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class MockAPIServer(ThreadingMixIn, HTTPServer):
+    """
+    Threaded HTTP server answering like the Submittable API. Response
+    bodies are generated once per URI and then served from memory.
+
+    :param port: Port to listen on (0 picks a free port).
+    :type port: int
+    :param latency: Seconds to wait before every response.
+    :type latency: float
+    """
+    daemon_threads = True
+
+    def __init__(self, port=0, latency=0.0):
+        HTTPServer.__init__(self, ('127.0.0.1', port), MockAPIHandler)
+        self.latency = latency
+        self.bodies = {}
+        self.file_body = b'x' * FILE_SIZE
+
+    @property
+    def base_uri(self):
+        return 'http://127.0.0.1:%s/v1/' % self.server_address[1]
+
+    def start(self):
+        """ Serve from a background thread and return the base URI. """
+        thread = threading.Thread(target=self.serve_forever)
+        thread.daemon = True
+        thread.start()
+        return self.base_uri
+
+
+if __name__ == '__main__':
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8000
+    latency = float(sys.argv[2]) / 1000 if len(sys.argv) > 2 else 0.0
+    server = MockAPIServer(port, latency)
+    print("Serving %s" % server.base_uri)
+    server.serve_forever()
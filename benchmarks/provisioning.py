@@ -0,0 +1,96 @@
+"""
+Benchmark for SubmittableAPIResponse provisioning of submission and payment
+pages. Builds synthetic pages of ``MAX_API_COUNT`` items and reports the time
+taken to turn each decoded page into item objects.
+
+Run from the repository root::
+
+    python benchmarks/provisioning.py
+
+"""
+from datetime import datetime, timedelta
+import json
+import os
+import sys
+import time
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from submittable_api_client import submittable_api_client as api  # noqa
+
+
+def submission_data(index, date):
+    return {
+        'submission_id': index,
+        'title': 'Submission %s' % index,
+        'status': 'inprogress',
+        'date_created': date,
+        'category': {'category_id': index % 5, 'name': 'Category'},
+        'submitter': {'user_id': index % 50, 'first_name': 'First',
+                      'last_name': 'Last', 'email': 'a@example.com'},
+        'payment': {'payment_id': index, 'amount': 3.0, 'fee': 0.5,
+                    'payment_date': date},
+        'votes': {'count': 2, 'score': 7, 'average': 3.5},
+        'labels': {'items': [{'label_text': 'Shortlist'}]},
+        'assignments': {'items': [{'user_id': 1, 'staff_name': 'Staff'}]},
+        'form': {'items': [{'label': 'Bio', 'data': 'Text'}]},
+        'files': [{'guid': 'guid%s' % index, 'file_name': 'entry.pdf',
+                   'file_size': 1024}],
+    }
+
+
+def page_content(count=api.MAX_API_COUNT):
+    start = datetime(2014, 5, 1, 9, 0, 0)
+    items = []
+    for index in range(count):
+        # Spread items over a few days the way a real page would be.
+        date = start + timedelta(minutes=37 * index)
+        items.append(submission_data(index, date.strftime(
+            api.TIMESTAMP_FORMAT)))
+    return json.dumps({
+        'current_page': 1, 'total_pages': 1, 'total_items': count,
+        'items_per_page': count, 'count': count, 'items': items,
+    }).encode('utf-8')
+
+
+def legacy_parse_timestamp(value):
+    """ The time.strptime + time.mktime path used before the fast parser. """
+    time_created = time.strptime(value, api.TIMESTAMP_FORMAT)
+    return time_created, datetime.fromtimestamp(time.mktime(time_created))
+
+
+def scan_ids(page):
+    """ Read only the fields a typical ID scan needs. """
+    return [(item.submission_id, item.status) for item in page.items]
+
+
+def bench(label, content, obj_type, number, lazy=False):
+    response = api.BufferedResponse(200, {}, content)
+    data = response.json()
+    seconds = min(timeit.repeat(
+        lambda: scan_ids(api.SubmittableAPIResponse(
+            response, obj_type, lazy=lazy, decoder=lambda content: data)),
+        number=number, repeat=5)) / number
+    print("%-32s %8.3f ms/page" % (label, seconds * 1000))
+    return seconds
+
+
+def main(number=20):
+    content = page_content()
+    print("Provisioning %s-item submission pages" % api.MAX_API_COUNT)
+    fast_parse = api._parse_timestamp
+    api._parse_timestamp = legacy_parse_timestamp
+    try:
+        before = bench("strptime + mktime", content, 'submissions', number)
+    finally:
+        api._parse_timestamp = fast_parse
+    after = bench("_parse_timestamp", content, 'submissions', number)
+    print("speedup: %.2fx" % (before / after))
+    lazy = bench("lazy=True, ID scan", content, 'submissions', number,
+                 lazy=True)
+    print("speedup: %.2fx" % (after / lazy))
+
+
+if __name__ == '__main__':
+    main()
@@ -12,5 +12,12 @@ setup(
         https://github.com/shawnr/submittable-api-client/archive/0.6.zip""",
     keywords=['API', 'REST', 'Submittable'],
     install_requires=['requests>=2.3.0'],
+    extras_require={
+        'async': ['aiohttp>=3.0'],
+        'numpy': ['numpy'],
+        'pandas': ['pandas'],
+        'arrow': ['pyarrow'],
+        'orjson': ['orjson'],
+    },
     classifiers=[],
 )
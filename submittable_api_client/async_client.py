@@ -0,0 +1,456 @@
+"""
+An asyncio version of :class:`SubmittableAPIClient` for use inside event
+loops. It exposes the same endpoints and returns the same
+:class:`SubmittableAPIResponse` and item objects, but performs its HTTP calls
+without blocking the loop.
+
+Requires Python 3.6+ and the aiohttp module:
+https://docs.aiohttp.org/
+
+.. moduleauthor:: Shawn Rider <shawn@shawnrider.com>
+
+"""
+import asyncio
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from .decoders import get_decoder
+from .submittable_api_client import (
+    ALLOWED_DIRECTIONS, ALLOWED_SORTS, ALLOWED_STATUSES,
+    DEFAULT_POOL_MAXSIZE, ENDPOINTS, MAX_API_COUNT, BufferedResponse,
+    SubmittableAPIResponse,
+)
+
+__all__ = ('AsyncSubmittableAPIClient',)
+
+
+class AsyncSubmittableAPIClient(object):
+    """
+    The asyncio counterpart of :class:`SubmittableAPIClient`. Every endpoint
+    is a coroutine returning the same objects as the blocking client.
+
+    :param username: Submittable.com username
+    :type username: str
+    :param apitoken: Submittable.com API token
+    :type apitoken: str
+    :param per_page: Per page item limit (defaults to 20)
+    :type per_page: int
+    :param pool_maxsize: Maximum number of kept-alive connections.
+    :type pool_maxsize: int
+    :param concurrency: Maximum number of requests in flight at once.
+    :type concurrency: int
+    :param keep_alive: Reuse connections between calls (defaults to True).
+    :type keep_alive: bool
+    :param json_decoder: JSON decoder for response bodies, see
+        :func:`decoders.get_decoder` (defaults to the fastest installed).
+    :type json_decoder: str
+
+    The connection pool is opened on first use. Await :meth:`close` when
+    finished, or use the client as an async context manager::
+
+        async with AsyncSubmittableAPIClient(
+                username='me', apitoken='555') as client:
+            await client.categories()
+    """
+
+    def __init__(self, username=None, apitoken=None, per_page=20,
+                 pool_maxsize=DEFAULT_POOL_MAXSIZE,
+                 concurrency=DEFAULT_POOL_MAXSIZE, keep_alive=True,
+                 json_decoder=None):
+        if aiohttp is None:
+            raise Exception(
+                'AsyncSubmittableAPIClient requires the aiohttp module.')
+        if not username or not apitoken:
+            raise Exception('No username/apitoken credentials supplied.')
+        self.username = username
+        self.apitoken = apitoken
+        self.per_page = per_page
+        self.start_page = 1
+        self.pool_maxsize = pool_maxsize
+        self.concurrency = concurrency
+        self.keep_alive = keep_alive
+        self.decode_json = get_decoder(json_decoder)
+        self.session = None
+        self._semaphore = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    def _get_session(self):
+        """ Open the pooled ClientSession inside the running loop. """
+        if self.session is None:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_maxsize,
+                force_close=not self.keep_alive,
+            )
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                auth=aiohttp.BasicAuth(self.username, self.apitoken),
+            )
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self.session
+
+    async def _get(self, query_uri):
+        """
+        Issue a GET request through the client's pooled ClientSession.
+
+        :param query_uri: Fully qualified URI to request.
+        :type query_uri: str
+
+        :returns: :class:`BufferedResponse`
+        """
+        session = self._get_session()
+        async with self._semaphore:
+            async with session.get(query_uri) as response:
+                content = await response.read()
+                return BufferedResponse(
+                    response.status, response.headers, content,
+                    url=query_uri)
+
+    def _response(self, response, obj_type):
+        """ Build a :class:`SubmittableAPIResponse` with the decoder. """
+        return SubmittableAPIResponse(
+            response=response, obj_type=obj_type, decoder=self.decode_json)
+
+    async def call(self, name, **params):
+        """
+        Request any endpoint in ``ENDPOINTS`` by name, see
+        :meth:`SubmittableAPIClient.call`.
+
+        :param name: Name of the endpoint.
+        :type name: str
+
+        :returns: :class:`SubmittableAPIResponse`
+        """
+        endpoint = ENDPOINTS.get(name)
+        if endpoint is None:
+            raise Exception('Endpoint not found: %s' % name)
+        response = await self._get(endpoint.uri(**params))
+
+        return self._response(response, name)
+
+    async def close(self):
+        """ Release all pooled connections held by the client. """
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def categories(self):
+        """
+        Returns a list of Categories. Allows no pagination.
+
+        :returns: :class:`SubmittableAPIResponse` containing a list of
+            content-specific objects and related metadata.
+        """
+        return await self.call('categories')
+
+    async def category(self, cat_id=None):
+        """
+        Returns information about a single Category.
+
+        :param cat_id: ID of Category
+        :type cat_id: int
+
+        :returns: :class:`SubmittableAPIResponse` containing a list of
+            content-specific objects and related metadata.
+        """
+        if not cat_id:
+            raise Exception('No Category ID specified.')
+
+        return await self.call('category', cat_id=cat_id)
+
+    async def category_form(self, cat_id=None):
+        """
+        Returns the form info associated with the Category.
+
+        :param cat_id: ID of Category
+        :type cat_id: int
+
+        :returns: :class:`SubmittableAPIResponse` containing a list of
+            content-specific objects and related metadata.
+        """
+        if not cat_id:
+            raise Exception('No Category ID specified.')
+
+        return await self.call('category_form', cat_id=cat_id)
+
+    async def category_submitters(self, cat_id=None, page=None,
+                                  per_page=None):
+        """
+        Returns user records that have submitted this form.
+
+        :param cat_id: ID of Category
+        :type cat_id: int
+        :param page: Page number to start on.
+        :type page: int
+        :param per_page: Number of items per page to return.
+        :type per_page: int
+
+        :returns: :class:`SubmittableAPIResponse` containing a list of
+            content-specific objects and related metadata.
+        """
+        if not cat_id:
+            raise Exception('No Category ID specified.')
+        per_page = per_page or self.per_page
+        page = page or self.start_page
+
+        return await self.call('category_submitters', cat_id=cat_id,
+                               page=page, count=per_page)
+
+    async def submissions(self, sort='submitted', direction='desc', page=1,
+                          per_page=20, status='inprogress'):
+        """
+        Returns a list of Submissions. Allows pagination, sorting and filters.
+
+        :param sort: Keyword for attribute to sort against.
+        :type sort: str
+        :param direction: Keyword for direction of sort (asc or desc).
+        :type direction: str
+        :param page: Page number to start on.
+        :type page: int
+        :param per_page: Number of items per page to return.
+        :type per_page: int
+        :param status: Keyword for Status value to filter against.
+        :type status: str
+
+        :returns: :class:`SubmittableAPIResponse` containing a list of
+            content-specific objects and related metadata.
+        """
+        if sort not in ALLOWED_SORTS:
+            raise Exception('Sort value not found: %s' % sort)
+
+        if direction not in ALLOWED_DIRECTIONS:
+            raise Exception('Direction value not found: %s' % direction)
+
+        if status == 'all':
+            status_list = ALLOWED_STATUSES
+        else:
+            status_list = status.split(',')
+        for val in status_list:
+            if val not in ALLOWED_STATUSES:
+                raise Exception('Status value not found: %s' % status)
+
+        per_page = min(per_page, MAX_API_COUNT)
+
+        return await self.call('submissions', sort=sort,
+                               direction=direction, page=page,
+                               count=per_page,
+                               status=",".join(status_list))
+
+    async def submission(self, sub_id=None):
+        """
+        Returns information about a single Submission.
+
+        :param sub_id: ID of Submission object to retrieve.
+        :type sub_id: int
+
+        :returns: :class:`SubmittableAPIResponse` containing a list of
+            content-specific objects and related metadata.
+        """
+        if not sub_id:
+            raise Exception('No Submission ID specified.')
+
+        return await self.call('submission', sub_id=sub_id)
+
+    async def submission_labels(self, sub_id=None):
+        """
+        Returns labels for a single Submission.
+
+        :param sub_id: ID of Submission object to retrieve.
+        :type sub_id: int
+
+        :returns: :class:`SubmittableAPIResponse` containing a list of
+            content-specific objects and related metadata.
+        """
+        if not sub_id:
+            raise Exception('No Submission ID specified.')
+
+        return await self.call('submission_labels', sub_id=sub_id)
+
+    async def submission_history(self, sub_id=None):
+        """
+        Returns history for a single Submission.
+
+        :param sub_id: ID of Submission object to retrieve.
+        :type sub_id: int
+
+        :returns: :class:`SubmittableAPIResponse` containing a list of
+            content-specific objects and related metadata.
+        """
+        if not sub_id:
+            raise Exception('No Submission ID specified.')
+
+        return await self.call('submission_history', sub_id=sub_id)
+
+    async def submission_file(self, sub_id=None, file_guid=None):
+        """
+        Returns a File attached to a single Submission.
+
+        :param sub_id: ID of Submission object to retrieve.
+        :type sub_id: int
+        :param file_guid: GUID for File object attached to Submission object.
+        :type file_guid: str
+
+        :returns: :class:`BufferedResponse` holding the file contents.
+        """
+        if not sub_id:
+            raise Exception('No Submission ID specified.')
+        if not file_guid:
+            raise Exception('No GUID specified.')
+
+        query_uri = ENDPOINTS['submission_file'].uri(
+            sub_id=sub_id, file_guid=file_guid)
+        return await self._get(query_uri)
+
+    async def submission_form(self, sub_id=None):
+        """
+        Returns Form attached to a single Submission.
+
+        :param sub_id: ID of Submission object to retrieve.
+        :type sub_id: int
+
+        :returns: :class:`SubmittableAPIResponse` containing a list of
+            content-specific objects and related metadata.
+        """
+        if not sub_id:
+            raise Exception('No Submission ID specified.')
+
+        return await self.call('submission_form', sub_id=sub_id)
+
+    async def submission_assignments(self, sub_id=None):
+        """
+        Returns Assignments attached to a single Submission.
+
+        :param sub_id: ID of Submission object to retrieve.
+        :type sub_id: int
+
+        :returns: :class:`SubmittableAPIResponse` containing a list of
+            content-specific objects and related metadata
+        """
+        if not sub_id:
+            raise Exception('No Submission ID specified.')
+
+        return await self.call('submission_assignments', sub_id=sub_id)
+
+    async def payments(self, year=None, month=None):
+        """
+        Returns Payments made in a given month.
+
+        :param year: Year (YYYY) value to filter against.
+        :type year: int
+        :param month: Numeric month (MM) value to filter against.
+        :type month: int
+
+        :returns: :class:`SubmittableAPIResponse` containing a list of
+            content-specific objects and related metadata.
+        """
+        if not year:
+            raise Exception('No Year specified.')
+        if not month:
+            raise Exception('No Month specified.')
+
+        return await self.call('payments', year=year, month=month)
+
+    async def submitters(self, page=1, per_page=20):
+        """
+        Returns Submitters for an Organization.
+
+        :param page: Page number to start on.
+        :type page: int
+        :param per_page: Number of items per page to return.
+        :type per_page: int
+
+        :returns: :class:`SubmittableAPIResponse` containing a list of
+            content-specific objects and related metadata.
+        """
+        return await self.call('submitters', page=page, count=per_page)
+
+    async def _iter_pages(self, fetch, page=None, concurrency=1, ordered=True,
+                          **kwargs):
+        """
+        Asynchronously yield one :class:`SubmittableAPIResponse` per page of
+        a paginated endpoint, requesting ``MAX_API_COUNT`` items per page.
+
+        After the first page reports ``total_pages`` the remaining pages are
+        fetched ``concurrency`` at a time.
+
+        :param fetch: Bound client coroutine accepting ``page``/``per_page``.
+        :type fetch: function
+        :param page: Page number to start on.
+        :type page: int
+        :param concurrency: Number of pages to fetch in parallel.
+        :type concurrency: int
+        :param ordered: Yield pages in page order (True) or in the order they
+            finish downloading (False).
+        :type ordered: bool
+        """
+        page = page or self.start_page
+        response = await fetch(page=page, per_page=MAX_API_COUNT, **kwargs)
+        yield response
+        if not response.items or page >= response.total_pages:
+            return
+
+        remaining = list(range(page + 1, response.total_pages + 1))
+        concurrency = max(concurrency, 1)
+        for start in range(0, len(remaining), concurrency):
+            batch = [
+                fetch(page=batch_page, per_page=MAX_API_COUNT, **kwargs)
+                for batch_page in remaining[start:start + concurrency]
+            ]
+            if ordered:
+                for response in await asyncio.gather(*batch):
+                    yield response
+            else:
+                for future in asyncio.as_completed(batch):
+                    yield await future
+
+    async def iter_submissions(self, sort='submitted', direction='desc',
+                               status='inprogress', page=None, concurrency=1,
+                               ordered=True):
+        """
+        Async generator of Submissions across all pages. Accepts the same
+        arguments as :meth:`SubmittableAPIClient.iter_submissions`.
+
+        :returns: Async generator of :class:`Submission` objects.
+        """
+        async for response in self._iter_pages(
+                self.submissions, page=page, concurrency=concurrency,
+                ordered=ordered, sort=sort, direction=direction,
+                status=status):
+            for item in response.items:
+                yield item
+
+    async def iter_submitters(self, page=None, concurrency=1, ordered=True):
+        """
+        Async generator of Submitters for an Organization across all pages.
+
+        :returns: Async generator of :class:`Submitter` objects.
+        """
+        async for response in self._iter_pages(
+                self.submitters, page=page, concurrency=concurrency,
+                ordered=ordered):
+            for item in response.items:
+                yield item
+
+    async def iter_category_submitters(self, cat_id=None, page=None,
+                                       concurrency=1, ordered=True):
+        """
+        Async generator of user records that have submitted to a Category,
+        across all pages.
+
+        :returns: Async generator of :class:`Submitter` objects.
+        """
+        if not cat_id:
+            raise Exception('No Category ID specified.')
+
+        async for response in self._iter_pages(
+                self.category_submitters, page=page, concurrency=concurrency,
+                ordered=ordered, cat_id=cat_id):
+            for item in response.items:
+                yield item
@@ -0,0 +1,179 @@
+"""
+Response caches for :class:`SubmittableAPIClient`. A cache stores the raw
+response for a query URI for a limited time so that repeated lookups of
+slow-changing data (categories and their forms) are served locally.
+
+Any object providing ``get(key)`` and ``set(key, value, ttl)`` can be used
+as a cache; :class:`MemoryCache` and :class:`SQLiteCache` are provided.
+
+.. moduleauthor:: Shawn Rider <shawn@shawnrider.com>
+
+"""
+from collections import OrderedDict
+import pickle
+import sqlite3
+import threading
+import time
+
+__all__ = ('MemoryCache', 'ResponseCache', 'SQLiteCache')
+
+
+class ResponseCache(object):
+    """
+    Base class for response caches. Keeps hit and miss counters; subclasses
+    implement ``_load``, ``_store``, ``delete`` and ``clear``.
+
+    :param maxsize: Maximum number of entries kept. The least recently used
+        entries are evicted first. None means unbounded.
+    :type maxsize: int
+    """
+    def __init__(self, maxsize=None):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Return the cached value for ``key``, or None if it is missing or
+        has expired.
+        """
+        with self.lock:
+            value = self._load(key, time.time())
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return value
+
+    def set(self, key, value, ttl):
+        """
+        Store ``value`` under ``key`` for ``ttl`` seconds.
+        """
+        with self.lock:
+            self._store(key, value, time.time() + ttl)
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        if not lookups:
+            return 0.0
+        return float(self.hits) / lookups
+
+
+class MemoryCache(ResponseCache):
+    """
+    In-process LRU cache.
+
+    :param maxsize: Maximum number of entries kept (defaults to 1024).
+    :type maxsize: int
+    """
+    def __init__(self, maxsize=1024):
+        super(MemoryCache, self).__init__(maxsize=maxsize)
+        self.entries = OrderedDict()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _load(self, key, now):
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return None
+        expires, value = entry
+        if expires <= now:
+            return None
+        # Re-inserting marks the entry as most recently used.
+        self.entries[key] = entry
+        return value
+
+    def _store(self, key, value, expires):
+        self.entries.pop(key, None)
+        self.entries[key] = (expires, value)
+        while self.maxsize and len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def delete(self, key):
+        """ Remove ``key`` from the cache. """
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def clear(self):
+        """ Remove every entry from the cache. """
+        with self.lock:
+            self.entries.clear()
+
+
+class SQLiteCache(ResponseCache):
+    """
+    LRU cache persisted to a SQLite database, so entries survive between
+    processes and can be shared by workers on the same machine.
+
+    :param path: Path of the SQLite database file.
+    :type path: str
+    :param maxsize: Maximum number of entries kept. None means unbounded.
+    :type maxsize: int
+    """
+    def __init__(self, path, maxsize=None):
+        super(SQLiteCache, self).__init__(maxsize=maxsize)
+        self.path = path
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS response_cache ("
+            "key TEXT PRIMARY KEY, expires REAL, accessed REAL, value BLOB)")
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS response_cache_accessed "
+            "ON response_cache (accessed)")
+        self.connection.commit()
+
+    def __len__(self):
+        with self.lock:
+            return self.connection.execute(
+                "SELECT COUNT(*) FROM response_cache").fetchone()[0]
+
+    def _load(self, key, now):
+        row = self.connection.execute(
+            "SELECT expires, value FROM response_cache WHERE key = ?",
+            (key,)).fetchone()
+        if row is None:
+            return None
+        expires, value = row
+        if expires <= now:
+            self.connection.execute(
+                "DELETE FROM response_cache WHERE key = ?", (key,))
+            self.connection.commit()
+            return None
+        self.connection.execute(
+            "UPDATE response_cache SET accessed = ? WHERE key = ?",
+            (now, key))
+        self.connection.commit()
+        return pickle.loads(bytes(value))
+
+    def _store(self, key, value, expires):
+        self.connection.execute(
+            "REPLACE INTO response_cache (key, expires, accessed, value) "
+            "VALUES (?, ?, ?, ?)",
+            (key, expires, time.time(),
+             sqlite3.Binary(pickle.dumps(value, pickle.HIGHEST_PROTOCOL))))
+        if self.maxsize:
+            self.connection.execute(
+                "DELETE FROM response_cache WHERE key IN ("
+                "SELECT key FROM response_cache ORDER BY accessed DESC "
+                "LIMIT -1 OFFSET ?)", (self.maxsize,))
+        self.connection.commit()
+
+    def delete(self, key):
+        """ Remove ``key`` from the cache. """
+        with self.lock:
+            self.connection.execute(
+                "DELETE FROM response_cache WHERE key = ?", (key,))
+            self.connection.commit()
+
+    def clear(self):
+        """ Remove every entry from the cache. """
+        with self.lock:
+            self.connection.execute("DELETE FROM response_cache")
+            self.connection.commit()
+
+    def close(self):
+        """ Close the database connection. """
+        self.connection.close()
@@ -0,0 +1,206 @@
+"""
+Columnar export of Submission and Payment pages. Columns are built straight
+from the decoded JSON items, without creating item objects, as typed
+``array.array`` columns that can be handed to NumPy, pandas or Arrow.
+
+NumPy, pandas and pyarrow are optional; they are only imported when output
+in their format is requested.
+
+.. moduleauthor:: Shawn Rider <shawn@shawnrider.com>
+
+"""
+from array import array
+from collections import OrderedDict
+
+from .submittable_api_client import DEFAULT_TIMESTAMP, _parse_timestamp
+
+__all__ = (
+    'COLUMNS_BY_TYPE', 'PAYMENT_COLUMNS', 'SUBMISSION_COLUMNS',
+    'PaymentSummary', 'PaymentTotals', 'build_columns', 'convert_columns',
+    'empty_columns', 'extend_columns',
+)
+
+# Column definitions: (name, path into the item data, typecode, default).
+# Typecodes are ``array`` typecodes; None keeps a plain list (used for
+# strings and booleans) and 'datetime' a list of datetime objects.
+SUBMISSION_COLUMNS = (
+    ('submission_id', ('submission_id',), 'l', 0),
+    ('status', ('status',), None, ''),
+    ('date_created', ('date_created',), 'datetime', DEFAULT_TIMESTAMP),
+    ('category_id', ('category', 'category_id'), 'l', 0),
+    ('user_id', ('submitter', 'user_id'), 'l', 0),
+    ('amount', ('payment', 'amount'), 'd', 0.0),
+    ('fee', ('payment', 'fee'), 'd', 0.0),
+)
+
+PAYMENT_COLUMNS = (
+    ('payment_id', ('payment_id',), 'l', 0),
+    ('payment_date', ('payment_date',), 'datetime', DEFAULT_TIMESTAMP),
+    ('amount', ('amount',), 'd', 0.0),
+    ('fee', ('fee',), 'd', 0.0),
+    ('refunded', ('refunded',), None, False),
+    ('settled', ('settled',), None, False),
+    ('category_id', ('category_id',), 'l', 0),
+    ('submission_id', ('submission_id',), 'l', 0),
+    ('user_id', ('submitter', 'user_id'), 'l', 0),
+)
+
+COLUMNS_BY_TYPE = {
+    'submissions': SUBMISSION_COLUMNS,
+    'payments': PAYMENT_COLUMNS,
+}
+
+
+def _values(items, path, typecode, default):
+    """ Pull one column's values out of a list of item dictionaries. """
+    if len(path) == 1:
+        key = path[0]
+        values = [item.get(key, default) for item in items]
+    else:
+        parent, key = path
+        values = [(item.get(parent) or {}).get(key, default)
+                  for item in items]
+    # The API sends null for some missing values.
+    values = [default if value is None else value for value in values]
+    if typecode == 'datetime':
+        return [_parse_timestamp(value)[1] for value in values]
+    return values
+
+
+def empty_columns(spec):
+    """
+    Return an empty set of columns for a column definition.
+
+    :param spec: Column definition, e.g. ``SUBMISSION_COLUMNS``.
+    :type spec: tuple
+
+    :returns: OrderedDict of column name to column.
+    """
+    columns = OrderedDict()
+    for name, path, typecode, default in spec:
+        if typecode in (None, 'datetime'):
+            columns[name] = []
+        else:
+            columns[name] = array(typecode)
+    return columns
+
+
+def extend_columns(columns, spec, items):
+    """
+    Append the values of ``items`` to ``columns``.
+
+    :param columns: Columns from :func:`empty_columns`.
+    :type columns: OrderedDict
+    :param spec: Column definition the columns were built with.
+    :type spec: tuple
+    :param items: Item data dictionaries.
+    :type items: list
+    """
+    for name, path, typecode, default in spec:
+        columns[name].extend(_values(items, path, typecode, default))
+    return columns
+
+
+def build_columns(items, spec):
+    """
+    Build columns for a list of item data dictionaries.
+
+    :param items: Item data dictionaries.
+    :type items: list
+    :param spec: Column definition, e.g. ``PAYMENT_COLUMNS``.
+    :type spec: tuple
+
+    :returns: OrderedDict of column name to column.
+    """
+    return extend_columns(empty_columns(spec), spec, items)
+
+
+def convert_columns(columns, output=None):
+    """
+    Convert columns to another format.
+
+    :param columns: Columns from :func:`build_columns`.
+    :type columns: OrderedDict
+    :param output: None to keep the columns as they are, ``numpy`` for a
+        dict of NumPy arrays, ``pandas`` for a DataFrame or ``arrow`` for a
+        pyarrow Table.
+    :type output: str
+    """
+    if output is None:
+        return columns
+    if output == 'numpy':
+        import numpy
+        return OrderedDict(
+            (name, numpy.asarray(values, dtype='datetime64[s]')
+             if values and hasattr(values[0], 'isoformat')
+             else numpy.asarray(values))
+            for name, values in columns.items())
+    if output == 'pandas':
+        import pandas
+        return pandas.DataFrame(convert_columns(columns, 'numpy'))
+    if output == 'arrow':
+        import pyarrow
+        return pyarrow.table(OrderedDict(
+            (name, list(values)) for name, values in columns.items()))
+    raise Exception('Column output not recognized: %s' % output)
+
+
+class PaymentTotals(object):
+    """
+    Running count and sums of Payment amounts and fees.
+    """
+    __slots__ = ('count', 'amount', 'fee')
+
+    def __init__(self):
+        self.count = 0
+        self.amount = 0.0
+        self.fee = 0.0
+
+    def add(self, count, amount, fee):
+        self.count += count
+        self.amount += amount
+        self.fee += fee
+
+
+class PaymentSummary(object):
+    """
+    Payment totals overall (``total``), per ``(year, month)``
+    (``by_month``), per ``category_id`` (``by_category``) and for
+    ``refunded``, ``settled`` and ``unsettled`` payments. Built from Payment
+    columns, so no Payment objects are created.
+    """
+    def __init__(self):
+        self.total = PaymentTotals()
+        self.by_month = {}
+        self.by_category = {}
+        self.refunded = PaymentTotals()
+        self.settled = PaymentTotals()
+        self.unsettled = PaymentTotals()
+
+    def add(self, month, columns):
+        """
+        Add one month of Payment columns to the summary.
+
+        :param month: ``(year, month)`` the columns belong to.
+        :type month: tuple
+        :param columns: Columns built with ``PAYMENT_COLUMNS``.
+        :type columns: OrderedDict
+        """
+        amounts = columns['amount']
+        fees = columns['fee']
+        count, amount, fee = len(amounts), sum(amounts), sum(fees)
+        self.total.add(count, amount, fee)
+        self.by_month.setdefault(month, PaymentTotals()).add(
+            count, amount, fee)
+
+        for category_id, refunded, settled, amount, fee in zip(
+                columns['category_id'], columns['refunded'],
+                columns['settled'], amounts, fees):
+            self.by_category.setdefault(category_id, PaymentTotals()).add(
+                1, amount, fee)
+            if refunded:
+                self.refunded.add(1, amount, fee)
+            elif settled:
+                self.settled.add(1, amount, fee)
+            else:
+                self.unsettled.add(1, amount, fee)
@@ -0,0 +1,71 @@
+"""
+JSON decoders for API response bodies. Large Submission pages spend much of
+their time in the standard library decoder, so the fastest installed library
+among orjson, ujson and simdjson is used automatically, falling back to the
+standard library ``json`` module.
+
+.. moduleauthor:: Shawn Rider <shawn@shawnrider.com>
+
+"""
+import json
+
+__all__ = ('DECODER_PREFERENCE', 'available_decoders', 'get_decoder')
+
+# Decoders tried, fastest first, when none is named.
+DECODER_PREFERENCE = ('orjson', 'ujson', 'simdjson', 'json')
+
+_loaded = {}
+
+
+def _stdlib_loads(content):
+    """ Decode a response body with the standard library. """
+    if isinstance(content, bytes):
+        content = content.decode('utf-8')
+    return json.loads(content)
+
+
+def _load(name):
+    """ Return the ``loads`` function of decoder ``name``, or None. """
+    if name not in _loaded:
+        if name == 'json':
+            _loaded[name] = _stdlib_loads
+        else:
+            try:
+                module = __import__(name)
+            except ImportError:
+                module = None
+            _loaded[name] = getattr(module, 'loads', None)
+    return _loaded[name]
+
+
+def available_decoders():
+    """
+    Names of the installed decoders, fastest first.
+
+    :returns: list
+    """
+    return [name for name in DECODER_PREFERENCE if _load(name)]
+
+
+def get_decoder(decoder=None):
+    """
+    Return a function decoding a JSON response body (bytes) to Python
+    objects.
+
+    :param decoder: One of ``orjson``, ``ujson``, ``simdjson`` or ``json``,
+        a function taking the body, or None to use the fastest installed
+        decoder.
+    :type decoder: str
+
+    :returns: function
+    """
+    if callable(decoder):
+        return decoder
+    if decoder is None:
+        return _load(available_decoders()[0])
+    if decoder not in DECODER_PREFERENCE:
+        raise Exception('JSON decoder not recognized: %s' % decoder)
+    loads = _load(decoder)
+    if loads is None:
+        raise Exception('JSON decoder not installed: %s' % decoder)
+    return loads
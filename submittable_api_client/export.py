@@ -0,0 +1,407 @@
+"""
+Bulk export of an organization's Submittable data. :class:`BulkExport`
+splits the work into shards (one per range of pages, or per month of
+payments), runs the shards across a pool of processes that each hold
+their own pooled client, and writes each shard to its own newline-delimited
+JSON or Parquet file. A ``manifest.json`` holds the plan made by the first
+run and lists the finished shards, so an interrupted export picks up where
+it stopped.
+
+Run from the command line with::
+
+    python -m submittable_api_client.export --username you@example.com \\
+        --apitoken 555 --directory export --payments-start 2014-01
+
+.. moduleauthor:: Shawn Rider <shawn@shawnrider.com>
+
+"""
+import argparse
+from datetime import date
+import json
+import logging
+from multiprocessing import Pool
+import os
+import time
+
+from .submittable_api_client import (
+    MAX_API_COUNT, SUBMISSION_DETAIL_PARTS, SubmittableAPIClient,
+    _bounded_map, _month_range, _replace,
+)
+
+__all__ = ('BulkExport',)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EXPORT_PROCESSES = 4
+DEFAULT_PAGES_PER_SHARD = 5
+DEFAULT_EXPORT_DETAIL_CONCURRENCY = 4
+MANIFEST_NAME = 'manifest.json'
+
+# Parts of each submission fetched in addition to the submission itself.
+EXPORT_DETAIL_PARTS = tuple(
+    part for part, method in SUBMISSION_DETAIL_PARTS if part != 'submission')
+
+OUTPUT_EXTENSIONS = {
+    'ndjson': '.ndjson',
+    'parquet': '.parquet',
+}
+
+# The client held by each worker process, set up by _init_worker.
+_worker_client = None
+
+
+def _init_worker(username, apitoken, client_options):
+    global _worker_client
+    _worker_client = SubmittableAPIClient(
+        username=username, apitoken=apitoken, **client_options)
+
+
+def _add_details(client, items, include, concurrency):
+    """
+    Attach the requested detail parts to each submission item. A part that
+    fails is recorded under the item's ``detail_errors`` instead.
+
+    :returns: Number of parts that failed.
+    """
+    methods = dict(SUBMISSION_DETAIL_PARTS)
+    tasks = [(item, part) for item in items for part in include]
+
+    def fetch_part(task):
+        item, part = task
+        try:
+            response = client.call(
+                methods[part], lazy=True, sub_id=item['submission_id'])
+        except Exception as error:
+            return item, part, None, error
+        return item, part, response.data, None
+
+    failures = 0
+    for item, part, data, error in _bounded_map(
+            fetch_part, tasks, concurrency, ordered=False):
+        if error is not None:
+            logger.warning("Fetching %s of Submission %s failed: %s",
+                           part, item.get('submission_id'), error)
+            item.setdefault('detail_errors', {})[part] = str(error)
+            failures += 1
+        else:
+            item.setdefault('details', {})[part] = data
+    return failures
+
+
+def _shard_records(client, kind, params, include, detail_concurrency):
+    """
+    Fetch the records of one shard as item dictionaries.
+
+    :returns: The records, and the number of detail parts that failed.
+    """
+    if kind == 'categories':
+        return client.call(
+            'categories', lazy=True).data.get('items', []), 0
+    if kind == 'payments':
+        return client.payments(
+            year=params['year'], month=params['month'],
+            lazy=True).data.get('items', []), 0
+
+    records = []
+    failures = 0
+    for page in range(params['first_page'], params['last_page'] + 1):
+        if kind == 'submitters':
+            response = client.submitters(
+                page=page, per_page=MAX_API_COUNT, lazy=True)
+        else:
+            # Oldest first, so new submissions only add pages at the end.
+            response = client.submissions(
+                sort='submitted', direction='asc', page=page,
+                per_page=MAX_API_COUNT, status='all', lazy=True)
+        items = response.data.get('items', [])
+        if kind == 'submissions' and include:
+            failures += _add_details(
+                client, items, include, detail_concurrency)
+        records.extend(items)
+    return records, failures
+
+
+def _write_shard(path, records, output):
+    """ Write records to ``path``, replacing it only once complete. """
+    temp_path = "%s.tmp" % path
+    if output == 'parquet':
+        import pyarrow
+        import pyarrow.parquet
+        pyarrow.parquet.write_table(
+            pyarrow.Table.from_pylist(records), temp_path)
+    else:
+        with open(temp_path, 'w') as shard_file:
+            for record in records:
+                shard_file.write(json.dumps(record))
+                shard_file.write('\n')
+    _replace(temp_path, path)
+    return os.path.getsize(path)
+
+
+def _export_shard(task):
+    """ Fetch and write one shard in a worker process. """
+    name, kind, params, path, output, include, detail_concurrency = task
+    records, failures = _shard_records(
+        _worker_client, kind, params, include, detail_concurrency)
+    size = _write_shard(path, records, output)
+    return (name, kind, params, os.path.basename(path), len(records), size,
+            failures)
+
+
+class BulkExport(object):
+    """
+    Exports categories, submissions with their details, submitters and
+    payments to sharded files in ``directory``. A detail part that fails,
+    e.g. for a deleted submission, is recorded as a message under the
+    submission's ``detail_errors``, and the shard's ``detail_failures`` in
+    the manifest counts them.
+
+    :param username: Submittable.com username
+    :type username: str
+    :param apitoken: Submittable.com API token
+    :type apitoken: str
+    :param directory: Directory the shards and manifest are written to.
+    :type directory: str
+    :param processes: Number of worker processes.
+    :type processes: int
+    :param pages_per_shard: Pages of ``MAX_API_COUNT`` submissions or
+        submitters in each shard.
+    :type pages_per_shard: int
+    :param output: ``ndjson``, or ``parquet`` (requires pyarrow).
+    :type output: str
+    :param include: Submission detail parts to export, any of ``labels``,
+        ``history``, ``form`` and ``assignments`` (defaults to all).
+    :type include: iterable
+    :param payments_start: First month of payments, as ``(year, month)``
+        or a date. Payments are not exported without it.
+    :type payments_start: tuple
+    :param payments_end: Last month of payments (defaults to this month).
+    :type payments_end: tuple
+    :param detail_concurrency: Detail calls in flight in each process.
+    :type detail_concurrency: int
+    :param client_options: Extra keyword arguments for each process's
+        :class:`SubmittableAPIClient`, e.g. ``rate_limit``.
+    :type client_options: dict
+    """
+    def __init__(self, username=None, apitoken=None, directory=None,
+                 processes=DEFAULT_EXPORT_PROCESSES,
+                 pages_per_shard=DEFAULT_PAGES_PER_SHARD, output='ndjson',
+                 include=None, payments_start=None, payments_end=None,
+                 detail_concurrency=DEFAULT_EXPORT_DETAIL_CONCURRENCY,
+                 client_options=None):
+        if not username or not apitoken:
+            raise Exception('No username/apitoken credentials supplied.')
+        if not directory:
+            raise Exception('No export directory specified.')
+        if output not in OUTPUT_EXTENSIONS:
+            raise Exception('Export output not recognized: %s' % output)
+        include = EXPORT_DETAIL_PARTS if include is None else tuple(include)
+        for part in include:
+            if part not in EXPORT_DETAIL_PARTS:
+                raise Exception('Detail part not found: %s' % part)
+        self.username = username
+        self.apitoken = apitoken
+        self.directory = directory
+        self.processes = processes
+        self.pages_per_shard = pages_per_shard
+        self.output = output
+        self.include = include
+        self.payments_start = payments_start
+        self.payments_end = payments_end or date.today()
+        self.detail_concurrency = detail_concurrency
+        self.client_options = client_options or {}
+        self.manifest_path = os.path.join(directory, MANIFEST_NAME)
+        self.manifest = None
+
+    def load_manifest(self):
+        """ Read the manifest of an earlier run, or start a new one. """
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path) as manifest_file:
+                self.manifest = json.load(manifest_file)
+        else:
+            self.manifest = {
+                'output': self.output,
+                'started': time.time(),
+                'finished': None,
+                'shards': {},
+            }
+        return self.manifest
+
+    def save_manifest(self):
+        """ Write the manifest to ``directory``. """
+        temp_path = "%s.tmp" % self.manifest_path
+        with open(temp_path, 'w') as manifest_file:
+            json.dump(self.manifest, manifest_file, indent=2, sort_keys=True)
+        _replace(temp_path, self.manifest_path)
+
+    def _page_shards(self, kind, total_pages):
+        shards = []
+        for first in range(1, total_pages + 1, self.pages_per_shard):
+            last = min(first + self.pages_per_shard - 1, total_pages)
+            shards.append(("%s-%05d-%05d" % (kind, first, last), kind,
+                           {'first_page': first, 'last_page': last}))
+        return shards
+
+    def plan(self, client):
+        """
+        Return every shard of the export as ``(name, kind, params)``.
+
+        :param client: Client used to count the pages to export.
+        :type client: :class:`SubmittableAPIClient`
+        """
+        shards = [('categories', 'categories', {})]
+        submissions = client.submissions(
+            sort='submitted', direction='asc', per_page=MAX_API_COUNT,
+            status='all', lazy=True)
+        shards.extend(self._page_shards(
+            'submissions', submissions.total_pages))
+        submitters = client.submitters(per_page=MAX_API_COUNT, lazy=True)
+        shards.extend(self._page_shards('submitters', submitters.total_pages))
+        shards.extend(self._payment_shards())
+        return shards
+
+    def _payment_shards(self):
+        if not self.payments_start:
+            return []
+        return [("payments-%04d-%02d" % (year, month), 'payments',
+                 {'year': year, 'month': month})
+                for year, month in _month_range(
+                    self.payments_start, self.payments_end)]
+
+    def stored_plan(self):
+        """
+        The shards planned by the first run into ``directory``, or None.
+
+        Page ranges depend on the number of pages at the time of planning,
+        so a resumed run keeps the stored shards rather than planning again;
+        otherwise new pages would shift the ranges and finished pages would
+        be exported twice. Payment shards cover one month each and cannot
+        overlap, so months added since are exported as well.
+        """
+        plan = self.manifest.get('plan')
+        if plan is None:
+            return None
+        for setting, value in (('pages_per_shard', self.pages_per_shard),
+                               ('include', list(self.include))):
+            if plan[setting] != value:
+                raise Exception(
+                    'Export directory was planned with %s=%s.' % (
+                        setting, plan[setting]))
+        shards = [tuple(shard) for shard in plan['shards']]
+        planned = set(shard[0] for shard in shards)
+        shards.extend(shard for shard in self._payment_shards()
+                      if shard[0] not in planned)
+        return shards
+
+    def pending(self, shards):
+        """ The shards that have not been written by an earlier run. """
+        done = self.manifest['shards']
+        return [shard for shard in shards if not (
+            shard[0] in done and os.path.exists(
+                os.path.join(self.directory, done[shard[0]]['file'])))]
+
+    def run(self):
+        """
+        Export every shard not already finished and return the manifest.
+
+        :returns: dict
+        """
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory)
+        self.load_manifest()
+        if self.manifest.get('output', self.output) != self.output:
+            raise Exception(
+                'Export directory holds %s output.' % self.manifest['output'])
+
+        shards = self.stored_plan()
+        if shards is None:
+            with SubmittableAPIClient(
+                    username=self.username, apitoken=self.apitoken,
+                    **self.client_options) as client:
+                shards = self.plan(client)
+            self.manifest['plan'] = {
+                'pages_per_shard': self.pages_per_shard,
+                'include': list(self.include),
+                'shards': shards,
+            }
+        extension = OUTPUT_EXTENSIONS[self.output]
+        tasks = [
+            (name, kind, params,
+             os.path.join(self.directory, name + extension), self.output,
+             self.include if kind == 'submissions' else (),
+             self.detail_concurrency)
+            for name, kind, params in self.pending(shards)]
+
+        self.manifest['finished'] = None
+        self.save_manifest()
+        if tasks:
+            pool = Pool(
+                self.processes, initializer=_init_worker,
+                initargs=(self.username, self.apitoken, self.client_options))
+            try:
+                for (name, kind, params, filename, records, size,
+                     failures) in pool.imap_unordered(_export_shard, tasks):
+                    self.manifest['shards'][name] = {
+                        'kind': kind,
+                        'params': params,
+                        'file': filename,
+                        'records': records,
+                        'bytes': size,
+                        'detail_failures': failures,
+                    }
+                    self.save_manifest()
+                pool.close()
+            finally:
+                pool.terminate()
+                pool.join()
+
+        self.manifest['finished'] = time.time()
+        self.save_manifest()
+        return self.manifest
+
+
+def _month(value):
+    year, month = value.split('-')
+    return int(year), int(month)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Export Submittable data to sharded files.')
+    parser.add_argument('--username', required=True)
+    parser.add_argument('--apitoken',
+                        default=os.environ.get('SUBMITTABLE_API_TOKEN'))
+    parser.add_argument('--directory', required=True)
+    parser.add_argument('--processes', type=int,
+                        default=DEFAULT_EXPORT_PROCESSES)
+    parser.add_argument('--pages-per-shard', type=int,
+                        default=DEFAULT_PAGES_PER_SHARD)
+    parser.add_argument('--output', choices=sorted(OUTPUT_EXTENSIONS),
+                        default='ndjson')
+    parser.add_argument('--include', action='append',
+                        choices=EXPORT_DETAIL_PARTS,
+                        help='submission detail part (default: all)')
+    parser.add_argument('--payments-start', type=_month,
+                        help='first month of payments, YYYY-MM')
+    parser.add_argument('--payments-end', type=_month,
+                        help='last month of payments, YYYY-MM')
+    args = parser.parse_args(argv)
+
+    manifest = BulkExport(
+        username=args.username, apitoken=args.apitoken,
+        directory=args.directory, processes=args.processes,
+        pages_per_shard=args.pages_per_shard, output=args.output,
+        include=args.include, payments_start=args.payments_start,
+        payments_end=args.payments_end).run()
+    shards = manifest['shards'].values()
+    records = sum(shard['records'] for shard in shards)
+    failures = sum(shard.get('detail_failures', 0) for shard in shards)
+    print("Exported %d records in %d shards to %s" % (
+        records, len(shards), args.directory))
+    if failures:
+        print("%d submission detail parts failed; see 'detail_errors'."
+              % failures)
+
+
+if __name__ == '__main__':
+    main()
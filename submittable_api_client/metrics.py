@@ -0,0 +1,207 @@
+"""
+Request instrumentation for :class:`SubmittableAPIClient`. The client calls
+each of its ``hooks`` with a :class:`RequestEvent` after every API call;
+:class:`MetricsCollector` aggregates events for Prometheus and
+:class:`StatsdHook` forwards them to a StatsD server.
+
+.. moduleauthor:: Shawn Rider <shawn@shawnrider.com>
+
+"""
+import socket
+import threading
+
+__all__ = ('MetricsCollector', 'RequestEvent', 'StatsdHook')
+
+# Upper bounds, in seconds, of the request latency histogram buckets.
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class RequestEvent(object):
+    """
+    Timings and sizes for one API call. Times are in seconds; ``ttfb`` is
+    None when the response did not come from the network.
+
+    :param endpoint: Name of the endpoint called.
+    :type endpoint: str
+    :param uri: Fully qualified URI requested.
+    :type uri: str
+    :param status_code: HTTP status code of the final response, 304 for a
+        response revalidated from the client's ``revalidation_store``.
+    :type status_code: int
+    :param bytes_received: Size of the response body sent by the API.
+    :type bytes_received: int
+    :param ttfb: Time from sending the request until its headers arrived.
+    :type ttfb: float
+    :param total: Time for the whole exchange, including retries.
+    :type total: float
+    :param retries: Number of retries made for 429 and 5xx responses.
+    :type retries: int
+    :param decode: Time spent decoding the JSON body.
+    :type decode: float
+    :param provision: Time spent building item objects.
+    :type provision: float
+    """
+    __slots__ = (
+        'endpoint', 'uri', 'status_code', 'bytes_received', 'ttfb', 'total',
+        'retries', 'decode', 'provision',
+    )
+
+    def __init__(self, endpoint, uri, status_code, bytes_received=0,
+                 ttfb=None, total=0.0, retries=0, decode=0.0, provision=0.0):
+        self.endpoint = endpoint
+        self.uri = uri
+        self.status_code = status_code
+        self.bytes_received = bytes_received
+        self.ttfb = ttfb
+        self.total = total
+        self.retries = retries
+        self.decode = decode
+        self.provision = provision
+
+
+class EndpointStats(object):
+    """
+    Totals for one endpoint kept by :class:`MetricsCollector`.
+
+    :param buckets: Upper bounds of the latency histogram buckets.
+    :type buckets: tuple
+    """
+    __slots__ = (
+        'requests', 'statuses', 'retries', 'bytes_received', 'ttfb',
+        'total', 'decode', 'provision', 'buckets',
+    )
+
+    def __init__(self, buckets):
+        self.requests = 0
+        self.statuses = {}
+        self.retries = 0
+        self.bytes_received = 0
+        self.ttfb = 0.0
+        self.total = 0.0
+        self.decode = 0.0
+        self.provision = 0.0
+        self.buckets = [0] * len(buckets)
+
+    def add(self, event, bounds):
+        self.requests += 1
+        self.statuses[event.status_code] = (
+            self.statuses.get(event.status_code, 0) + 1)
+        self.retries += event.retries
+        self.bytes_received += event.bytes_received
+        self.ttfb += event.ttfb or 0.0
+        self.total += event.total
+        self.decode += event.decode
+        self.provision += event.provision
+        for index, bound in enumerate(bounds):
+            if event.total <= bound:
+                self.buckets[index] += 1
+
+
+class MetricsCollector(object):
+    """
+    Hook aggregating :class:`RequestEvent` objects per endpoint. Pass it in
+    the client's ``hooks`` and read ``endpoints``, or serve
+    :meth:`prometheus` from a metrics endpoint.
+
+    :param buckets: Upper bounds, in seconds, of the latency histogram
+        buckets.
+    :type buckets: tuple
+    """
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.bounds = tuple(sorted(buckets))
+        self.endpoints = {}
+        self.lock = threading.Lock()
+
+    def __call__(self, event):
+        with self.lock:
+            stats = self.endpoints.get(event.endpoint)
+            if stats is None:
+                stats = self.endpoints[event.endpoint] = EndpointStats(
+                    self.bounds)
+            stats.add(event, self.bounds)
+
+    def prometheus(self, prefix='submittable'):
+        """
+        Return the collected metrics in the Prometheus text format.
+
+        :param prefix: Prefix of every metric name.
+        :type prefix: str
+
+        :returns: str
+        """
+        lines = []
+
+        def metric(name, kind, samples):
+            lines.append('# TYPE %s_%s %s' % (prefix, name, kind))
+            for suffix, labels, value in samples:
+                lines.append('%s_%s%s{%s} %s' % (
+                    prefix, name, suffix,
+                    ','.join('%s="%s"' % label for label in labels), value))
+
+        with self.lock:
+            endpoints = sorted(self.endpoints.items())
+            metric('requests_total', 'counter', [
+                ('', (('endpoint', name), ('status', status)), count)
+                for name, stats in endpoints
+                for status, count in sorted(stats.statuses.items())])
+            for name, attr in (('retries_total', 'retries'),
+                               ('response_bytes_total', 'bytes_received'),
+                               ('ttfb_seconds_total', 'ttfb'),
+                               ('decode_seconds_total', 'decode'),
+                               ('provision_seconds_total', 'provision')):
+                metric(name, 'counter', [
+                    ('', (('endpoint', endpoint),), getattr(stats, attr))
+                    for endpoint, stats in endpoints])
+            samples = []
+            for endpoint, stats in endpoints:
+                for bound, count in zip(self.bounds, stats.buckets):
+                    samples.append(('_bucket', (
+                        ('endpoint', endpoint), ('le', bound)), count))
+                samples.append(('_bucket', (
+                    ('endpoint', endpoint), ('le', '+Inf')), stats.requests))
+                samples.append((
+                    '_sum', (('endpoint', endpoint),), stats.total))
+                samples.append((
+                    '_count', (('endpoint', endpoint),), stats.requests))
+            metric('request_seconds', 'histogram', samples)
+        return '\n'.join(lines) + '\n'
+
+
+class StatsdHook(object):
+    """
+    Hook sending each :class:`RequestEvent` to a StatsD server over UDP as
+    counters and millisecond timers. Send errors are ignored.
+
+    :param host: StatsD server host.
+    :type host: str
+    :param port: StatsD server port.
+    :type port: int
+    :param prefix: Prefix of every metric name.
+    :type prefix: str
+    """
+    def __init__(self, host='localhost', port=8125, prefix='submittable'):
+        self.address = (host, port)
+        self.prefix = prefix
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def __call__(self, event):
+        name = '%s.%s' % (self.prefix, event.endpoint)
+        lines = [
+            '%s.requests:1|c' % name,
+            '%s.status.%s:1|c' % (name, event.status_code),
+            '%s.bytes:%d|c' % (name, event.bytes_received),
+            '%s.retries:%d|c' % (name, event.retries),
+            '%s.total:%.3f|ms' % (name, event.total * 1000),
+            '%s.decode:%.3f|ms' % (name, event.decode * 1000),
+            '%s.provision:%.3f|ms' % (name, event.provision * 1000),
+        ]
+        if event.ttfb is not None:
+            lines.append('%s.ttfb:%.3f|ms' % (name, event.ttfb * 1000))
+        try:
+            self.socket.sendto('\n'.join(lines).encode('utf-8'), self.address)
+        except socket.error:
+            pass
+
+    def close(self):
+        """ Close the UDP socket. """
+        self.socket.close()
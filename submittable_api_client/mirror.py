@@ -0,0 +1,441 @@
+"""
+A local mirror of an organization's Submittable data kept in a SQLite
+database. :class:`SubmittableMirror` copies categories, submitters,
+submissions, submission details and payments from the API, and answers
+queries from the local database, returning the usual item objects.
+
+.. moduleauthor:: Shawn Rider <shawn@shawnrider.com>
+
+"""
+from datetime import datetime
+import json
+import logging
+import sqlite3
+
+from .submittable_api_client import (
+    DEFAULT_DETAIL_CONCURRENCY, DEFAULT_PAYMENT_CONCURRENCY,
+    SUBMISSION_DETAIL_PARTS, TIMESTAMP_FORMAT,
+    BufferedResponse, Category, Payment, Submission, SubmissionDetail,
+    SubmittableAPIResponse, Submitter, _bounded_map, _month_range,
+)
+
+__all__ = ('SubmittableMirror',)
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS categories ("
+    "category_id INTEGER PRIMARY KEY, name TEXT, active INTEGER, data TEXT)",
+    "CREATE TABLE IF NOT EXISTS submitters ("
+    "user_id INTEGER PRIMARY KEY, email TEXT, data TEXT)",
+    "CREATE TABLE IF NOT EXISTS submissions ("
+    "submission_id INTEGER PRIMARY KEY, status TEXT, category_id INTEGER, "
+    "user_id INTEGER, date_created TEXT, score REAL, data TEXT)",
+    "CREATE INDEX IF NOT EXISTS submissions_status "
+    "ON submissions (status)",
+    "CREATE INDEX IF NOT EXISTS submissions_category_id "
+    "ON submissions (category_id)",
+    "CREATE INDEX IF NOT EXISTS submissions_user_id "
+    "ON submissions (user_id)",
+    "CREATE INDEX IF NOT EXISTS submissions_date_created "
+    "ON submissions (date_created)",
+    "CREATE TABLE IF NOT EXISTS submission_details ("
+    "submission_id INTEGER, part TEXT, data TEXT, "
+    "PRIMARY KEY (submission_id, part))",
+    "CREATE TABLE IF NOT EXISTS payments ("
+    "payment_id INTEGER PRIMARY KEY, submission_id INTEGER, "
+    "category_id INTEGER, user_id INTEGER, payment_date TEXT, amount REAL, "
+    "fee REAL, refunded INTEGER, settled INTEGER, data TEXT)",
+    "CREATE INDEX IF NOT EXISTS payments_submission_id "
+    "ON payments (submission_id)",
+    "CREATE INDEX IF NOT EXISTS payments_category_id "
+    "ON payments (category_id)",
+    "CREATE INDEX IF NOT EXISTS payments_user_id ON payments (user_id)",
+    "CREATE INDEX IF NOT EXISTS payments_payment_date "
+    "ON payments (payment_date)",
+)
+
+# Response type used to rebuild each stored submission detail part.
+DETAIL_OBJ_TYPES = dict(SUBMISSION_DETAIL_PARTS)
+
+# Submission detail parts stored per transaction.
+DETAIL_COMMIT_INTERVAL = 200
+
+
+def _timestamp(value):
+    """ Format a datetime the way the API does; pass strings through. """
+    if isinstance(value, datetime):
+        return value.strftime(TIMESTAMP_FORMAT)
+    return value
+
+
+class SubmittableMirror(object):
+    """
+    Keeps a copy of Submittable data in a SQLite database with indexes on
+    ``submission_id``, ``status``, ``category_id``, ``user_id`` and
+    ``date_created``. Each record's JSON is stored alongside the indexed
+    columns so that queries can return the usual item objects.
+
+    :param path: Path of the SQLite database file.
+    :type path: str
+    :param client: Client used by the ``sync_`` methods.
+    :type client: :class:`SubmittableAPIClient`
+    """
+    def __init__(self, path=None, client=None):
+        if not path:
+            raise Exception('No database path specified.')
+        self.path = path
+        self.client = client
+        self.connection = sqlite3.connect(path)
+        self.detail_errors = {}
+        for statement in SCHEMA:
+            self.connection.execute(statement)
+        self.connection.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """ Close the database connection. """
+        self.connection.close()
+
+    def _require_client(self):
+        if not self.client:
+            raise Exception('No client specified for syncing.')
+
+    def _store_submissions(self, items):
+        self.connection.executemany(
+            "REPLACE INTO submissions (submission_id, status, category_id, "
+            "user_id, date_created, score, data) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [(item.get('submission_id'), item.get('status'),
+              (item.get('category') or {}).get('category_id'),
+              (item.get('submitter') or {}).get('user_id'),
+              item.get('date_created'),
+              (item.get('votes') or {}).get('score'),
+              json.dumps(item)) for item in items])
+
+    def _store_submitters(self, items):
+        self.connection.executemany(
+            "REPLACE INTO submitters (user_id, email, data) VALUES (?, ?, ?)",
+            [(item.get('user_id'), item.get('email'), json.dumps(item))
+             for item in items])
+
+    def _store_payments(self, items):
+        self.connection.executemany(
+            "REPLACE INTO payments (payment_id, submission_id, category_id, "
+            "user_id, payment_date, amount, fee, refunded, settled, data) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [(item.get('payment_id'), item.get('submission_id'),
+              item.get('category_id'),
+              (item.get('submitter') or {}).get('user_id'),
+              item.get('payment_date'), item.get('amount'), item.get('fee'),
+              item.get('refunded'), item.get('settled'), json.dumps(item))
+             for item in items])
+
+    def sync_categories(self):
+        """
+        Copy every Category into the mirror.
+
+        :returns: Number of Categories stored.
+        """
+        self._require_client()
+        items = self.client.categories().data.get('items', [])
+        self.connection.executemany(
+            "REPLACE INTO categories (category_id, name, active, data) "
+            "VALUES (?, ?, ?, ?)",
+            [(item.get('category_id'), item.get('name'), item.get('active'),
+              json.dumps(item)) for item in items])
+        self.connection.commit()
+        return len(items)
+
+    def sync_submitters(self, concurrency=1):
+        """
+        Copy every Submitter into the mirror.
+
+        :param concurrency: Number of pages to fetch in parallel.
+        :type concurrency: int
+
+        :returns: Number of Submitters stored.
+        """
+        self._require_client()
+        count = 0
+        for response in self.client._iter_pages(
+                self.client.submitters, concurrency=concurrency, lazy=True):
+            items = response.data.get('items', [])
+            self._store_submitters(items)
+            self.connection.commit()
+            count += len(items)
+        return count
+
+    def sync_submissions(self, status='all', concurrency=1):
+        """
+        Copy every Submission with the given status into the mirror.
+
+        :param status: Keyword for Status value to filter against.
+        :type status: str
+        :param concurrency: Number of pages to fetch in parallel.
+        :type concurrency: int
+
+        :returns: Number of Submissions stored.
+        """
+        self._require_client()
+        count = 0
+        for response in self.client._iter_pages(
+                self.client.submissions, concurrency=concurrency,
+                status=status, lazy=True):
+            items = response.data.get('items', [])
+            self._store_submissions(items)
+            self.connection.commit()
+            count += len(items)
+        return count
+
+    def sync_submission_details(self, sub_ids=None, include=None,
+                                concurrency=DEFAULT_DETAIL_CONCURRENCY):
+        """
+        Copy the full record of Submissions into the mirror. Each part is
+        fetched as in :meth:`SubmittableAPIClient.fetch_submission_details`.
+        Parts are committed as they arrive, every ``DETAIL_COMMIT_INTERVAL``
+        parts, so an interrupted run keeps what it stored. A part that fails
+        is skipped, and its error is kept in ``detail_errors`` under
+        ``(submission_id, part)``.
+
+        :param sub_ids: IDs of Submissions (defaults to every Submission
+            in the mirror).
+        :type sub_ids: list
+        :param include: Parts to fetch (defaults to all).
+        :type include: iterable
+        :param concurrency: Number of API calls in flight at once.
+        :type concurrency: int
+
+        :returns: Number of parts stored.
+        """
+        self._require_client()
+        if sub_ids is None:
+            sub_ids = [row[0] for row in self.connection.execute(
+                "SELECT submission_id FROM submissions")]
+        include = include or DETAIL_OBJ_TYPES.keys()
+        for part in include:
+            if part not in DETAIL_OBJ_TYPES:
+                raise Exception('Detail part not found: %s' % part)
+        tasks = [(sub_id, part, method)
+                 for sub_id in sorted(set(sub_ids))
+                 for part, method in SUBMISSION_DETAIL_PARTS
+                 if part in include]
+
+        def fetch_part(task):
+            sub_id, part, method = task
+            try:
+                response = getattr(self.client, method)(sub_id=sub_id)
+            except Exception as error:
+                return sub_id, part, None, error
+            return sub_id, part, json.dumps(response.data), None
+
+        self.detail_errors = {}
+        count = 0
+        try:
+            for sub_id, part, data, error in _bounded_map(
+                    fetch_part, tasks, concurrency, ordered=False):
+                if error is not None:
+                    logger.warning("Fetching %s of Submission %s failed: %s",
+                                   part, sub_id, error)
+                    self.detail_errors[(sub_id, part)] = error
+                    continue
+                self.connection.execute(
+                    "REPLACE INTO submission_details "
+                    "(submission_id, part, data) VALUES (?, ?, ?)",
+                    (sub_id, part, data))
+                count += 1
+                if count % DETAIL_COMMIT_INTERVAL == 0:
+                    self.connection.commit()
+        finally:
+            self.connection.commit()
+        return count
+
+    def sync_payments(self, start=None, end=None,
+                      concurrency=DEFAULT_PAYMENT_CONCURRENCY):
+        """
+        Copy Payments for every month from ``start`` through ``end`` into
+        the mirror.
+
+        :param start: First month, as ``(year, month)`` or a date.
+        :type start: tuple
+        :param end: Last month, as ``(year, month)`` or a date.
+        :type end: tuple
+        :param concurrency: Number of months fetched at once.
+        :type concurrency: int
+
+        :returns: Number of Payments stored.
+        """
+        self._require_client()
+
+        def fetch_month(month):
+            return self.client.payments(
+                year=month[0], month=month[1], lazy=True)
+
+        count = 0
+        for response in _bounded_map(
+                fetch_month, _month_range(start, end), concurrency,
+                ordered=False):
+            items = response.data.get('items', [])
+            self._store_payments(items)
+            self.connection.commit()
+            count += len(items)
+        return count
+
+    def categories(self):
+        """
+        Returns every Category in the mirror.
+
+        :returns: List of :class:`Category` objects.
+        """
+        rows = self.connection.execute(
+            "SELECT data FROM categories ORDER BY category_id")
+        return [Category(json.loads(row[0])) for row in rows]
+
+    def submitters(self):
+        """
+        Returns every Submitter in the mirror.
+
+        :returns: List of :class:`Submitter` objects.
+        """
+        rows = self.connection.execute(
+            "SELECT data FROM submitters ORDER BY user_id")
+        return [Submitter(json.loads(row[0])) for row in rows]
+
+    def submission(self, sub_id=None):
+        """
+        Returns a single Submission from the mirror, or None.
+
+        :param sub_id: ID of Submission object to retrieve.
+        :type sub_id: int
+
+        :returns: :class:`Submission`
+        """
+        row = self.connection.execute(
+            "SELECT data FROM submissions WHERE submission_id = ?",
+            (sub_id,)).fetchone()
+        if row is None:
+            return None
+        return Submission(json.loads(row[0]))
+
+    def submission_detail(self, sub_id=None):
+        """
+        Returns the stored full record of a Submission.
+
+        :param sub_id: ID of Submission object to retrieve.
+        :type sub_id: int
+
+        :returns: :class:`SubmissionDetail`
+        """
+        detail = SubmissionDetail(sub_id)
+        for part, data in self.connection.execute(
+                "SELECT part, data FROM submission_details "
+                "WHERE submission_id = ?", (sub_id,)):
+            response = BufferedResponse(200, {}, data.encode('utf-8'))
+            detail.add(part, SubmittableAPIResponse(
+                response=response, obj_type=DETAIL_OBJ_TYPES[part]))
+        return detail
+
+    def query_submissions(self, status=None, category_id=None, user_id=None,
+                          min_score=None, since=None, until=None,
+                          newest_first=True, limit=None):
+        """
+        Returns Submissions in the mirror matching every given filter.
+
+        :param status: Status value, or a list of them.
+        :type status: str
+        :param category_id: ID of Category.
+        :type category_id: int
+        :param user_id: ID of the Submitter.
+        :type user_id: int
+        :param min_score: Only Submissions with a votes score above this.
+        :type min_score: float
+        :param since: Only Submissions created at or after this time.
+        :type since: datetime
+        :param until: Only Submissions created before this time.
+        :type until: datetime
+        :param newest_first: Sort by ``date_created`` descending.
+        :type newest_first: bool
+        :param limit: Maximum number of Submissions to return.
+        :type limit: int
+
+        :returns: List of :class:`Submission` objects.
+        """
+        clauses = []
+        params = []
+        if status:
+            if isinstance(status, (list, tuple, set)):
+                statuses = list(status)
+            else:
+                statuses = [status]
+            clauses.append("status IN (%s)" % ", ".join("?" * len(statuses)))
+            params.extend(statuses)
+        if category_id is not None:
+            clauses.append("category_id = ?")
+            params.append(category_id)
+        if user_id is not None:
+            clauses.append("user_id = ?")
+            params.append(user_id)
+        if min_score is not None:
+            clauses.append("score > ?")
+            params.append(min_score)
+        if since is not None:
+            clauses.append("date_created >= ?")
+            params.append(_timestamp(since))
+        if until is not None:
+            clauses.append("date_created < ?")
+            params.append(_timestamp(until))
+
+        sql = "SELECT data FROM submissions"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY date_created %s, submission_id %s" % (
+            ('DESC', 'DESC') if newest_first else ('ASC', 'ASC'))
+        if limit:
+            sql += " LIMIT %d" % limit
+        return [Submission(json.loads(row[0]))
+                for row in self.connection.execute(sql, params)]
+
+    def query_payments(self, category_id=None, user_id=None,
+                       submission_id=None, since=None, until=None):
+        """
+        Returns Payments in the mirror matching every given filter, oldest
+        first.
+
+        :param category_id: ID of Category.
+        :type category_id: int
+        :param user_id: ID of the Submitter.
+        :type user_id: int
+        :param submission_id: ID of Submission.
+        :type submission_id: int
+        :param since: Only Payments made at or after this time.
+        :type since: datetime
+        :param until: Only Payments made before this time.
+        :type until: datetime
+
+        :returns: List of :class:`Payment` objects.
+        """
+        clauses = []
+        params = []
+        for column, value in (('category_id', category_id),
+                              ('user_id', user_id),
+                              ('submission_id', submission_id)):
+            if value is not None:
+                clauses.append("%s = ?" % column)
+                params.append(value)
+        if since is not None:
+            clauses.append("payment_date >= ?")
+            params.append(_timestamp(since))
+        if until is not None:
+            clauses.append("payment_date < ?")
+            params.append(_timestamp(until))
+
+        sql = "SELECT data FROM payments"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY payment_date, payment_id"
+        return [Payment(json.loads(row[0]))
+                for row in self.connection.execute(sql, params)]
@@ -9,20 +9,44 @@ http://docs.python-requests.org/
 .. moduleauthor:: Shawn Rider <shawn@shawnrider.com>
 
 """
+from collections import deque
 from datetime import datetime
+from functools import partial
+import logging
+from multiprocessing.pool import ThreadPool
+import os
+import threading
 import time
+try:
+    import queue
+except ImportError:  # Python 2
+    import Queue as queue
 
 import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from .decoders import get_decoder
+from .metrics import RequestEvent
+from .throttling import (
+    AdaptiveConcurrencyLimiter, RateLimiter, _clock, retry_delay,
+)
 
 # Prevent import * from importing all our "local" globals and imports.
 __all__ = (
-    'Assignment', 'AssignmentsContainer', 'Category', 'File',
-    'FormFieldContainer', 'FormFieldItem', 'LabelsContainer',
-    'Payment', 'Submission', 'SubmissionHistory', 'SubmissionLabel',
-    'SubmittableAPIClient', 'SubmittableAPIResponse', 'SubmittedFormContainer',
-    'SubmittedFormField', 'Submitter', 'Votes',
+    'Assignment', 'AssignmentsContainer', 'BufferedResponse', 'Category',
+    'Endpoint', 'File', 'FormFieldContainer', 'FormFieldItem', 'IdentityMap',
+    'LabelsContainer',
+    'LazyItemList', 'LazySubmission', 'Payment', 'Submission',
+    'SubmissionDetail', 'SubmissionDetailBatch', 'SubmissionHistory',
+    'SubmissionLabel', 'SubmittableAPIClient', 'SubmittableAPIError',
+    'SubmittableAPIResponse',
+    'SubmittedFormContainer', 'SubmittedFormField', 'Submitter', 'Votes',
+    'register_endpoint',
 )
 
+logger = logging.getLogger(__name__)
+
 BASE_API_URI = "https://api.submittable.com/v1/"
 CATEGORIES_URI = "categories/"
 ORGANIZATION_URI = "organization/"  # This is currently not implemented due to
@@ -44,6 +68,36 @@ ALLOWED_DIRECTIONS = (
 
 MAX_API_COUNT = 200
 
+# Timestamps returned by the API, e.g. "2014-05-21T11:58:57".
+TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S"
+DEFAULT_TIMESTAMP = "2014-05-21T11:58:57"
+TIMESTAMP_CACHE_SIZE = 4096
+
+# Connection pool defaults for the client-owned requests Session. Every
+# endpoint talks to the same host, so a small pool of kept-alive sockets is
+# enough to avoid paying a TCP+TLS handshake on each call.
+DEFAULT_POOL_CONNECTIONS = 1
+DEFAULT_POOL_MAXSIZE = 10
+DEFAULT_MAX_RETRIES = 0
+
+# Responses with these status codes are retried with backoff. 429 means the
+# API is throttling us and also shrinks the adaptive concurrency limit.
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+DEFAULT_THROTTLE_RETRIES = 3
+DEFAULT_BACKOFF_FACTOR = 0.5
+DEFAULT_MAX_BACKOFF = 60
+
+# Seconds to keep cached responses for each endpoint when a cache is given
+# to the client. Endpoints not listed here are never cached.
+DEFAULT_CACHE_TTLS = {
+    'categories': 60 * 60,
+    'category': 60 * 60,
+    'category_form': 60 * 60,
+}
+
+# How long a stored response is kept for ETag/Last-Modified revalidation.
+DEFAULT_REVALIDATION_TTL = 7 * 24 * 60 * 60
+
 ALLOWED_STATUSES = (
     'new',
     'inprogress',
@@ -53,6 +107,259 @@ ALLOWED_STATUSES = (
     'withdrawn',
 )
 
+# Parts of a submission record that fetch_submission_details can assemble,
+# mapped to the client method that retrieves each one.
+SUBMISSION_DETAIL_PARTS = (
+    ('submission', 'submission'),
+    ('labels', 'submission_labels'),
+    ('history', 'submission_history'),
+    ('form', 'submission_form'),
+    ('assignments', 'submission_assignments'),
+)
+
+DEFAULT_DETAIL_CONCURRENCY = 8
+
+# File downloads are streamed to disk in chunks of this many bytes.
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+DEFAULT_DOWNLOAD_CONCURRENCY = 4
+
+# Number of months of payments fetched at once by payments_range.
+DEFAULT_PAYMENT_CONCURRENCY = 6
+
+
+def _bounded_map(func, iterable, concurrency, ordered=True):
+    """
+    Apply ``func`` to each value of ``iterable`` on a pool of ``concurrency``
+    threads and yield the results, either in input order or in completion
+    order. No more than ``concurrency`` calls are outstanding at once, so at
+    most that many results are buffered ahead of the consumer. An exception
+    raised by ``func`` is re-raised in the consuming thread.
+
+    :param func: Callable taking a single value.
+    :type func: function
+    :param iterable: Values to apply ``func`` to.
+    :type iterable: iterable
+    :param concurrency: Number of worker threads.
+    :type concurrency: int
+    :param ordered: Yield in input order (True) or completion order (False).
+    :type ordered: bool
+    """
+    values = iter(iterable)
+    pool = ThreadPool(concurrency)
+    pending = deque()
+    finished = queue.Queue()
+
+    def call(value):
+        try:
+            return True, func(value)
+        except Exception as exc:
+            return False, exc
+
+    def submit():
+        for value in values:
+            if ordered:
+                pending.append(pool.apply_async(call, (value,)))
+            else:
+                pool.apply_async(call, (value,), callback=finished.put)
+                pending.append(None)
+            return True
+        return False
+
+    try:
+        for _ in range(concurrency):
+            if not submit():
+                break
+        while pending:
+            if ordered:
+                succeeded, result = pending.popleft().get()
+            else:
+                pending.popleft()
+                succeeded, result = finished.get()
+            if not succeeded:
+                raise result
+            submit()
+            yield result
+    finally:
+        pool.terminate()
+
+
+_timestamp_cache = {}
+
+
+def _parse_timestamp(value):
+    """
+    Parse an API timestamp into a ``(struct_time, datetime)`` pair.
+
+    Timestamps in the fixed ``TIMESTAMP_FORMAT`` are sliced directly
+    instead of going through ``time.strptime``, and results are memoized
+    since pages repeat the same dates. Both values are naive and hold the
+    time exactly as the API sent it.
+
+    :param value: Timestamp string.
+    :type value: str
+    """
+    parsed = _timestamp_cache.get(value)
+    if parsed is not None:
+        return parsed
+
+    if (len(value) == 19 and value[4] == '-' and value[7] == '-' and
+            value[10] == 'T' and value[13] == ':' and value[16] == ':'):
+        date = datetime(
+            int(value[0:4]), int(value[5:7]), int(value[8:10]),
+            int(value[11:13]), int(value[14:16]), int(value[17:19]),
+        )
+    else:
+        date = datetime.strptime(value, TIMESTAMP_FORMAT)
+    parsed = (date.timetuple(), date)
+
+    if len(_timestamp_cache) >= TIMESTAMP_CACHE_SIZE:
+        _timestamp_cache.clear()
+    _timestamp_cache[value] = parsed
+    return parsed
+
+
+def _replace(source, destination):
+    """
+    Move ``source`` over ``destination`` in one step, so an interrupted
+    write never leaves a truncated file behind.
+    """
+    # os.replace is Python 3 only.
+    if hasattr(os, 'replace'):
+        os.replace(source, destination)
+    else:
+        if os.name == 'nt' and os.path.exists(destination):
+            os.remove(destination)
+        os.rename(source, destination)
+
+
+def _download_name(file_obj):
+    """
+    The name to save a :class:`File` under. ``file_name`` comes from the
+    submitter, so any directories in it are dropped.
+    """
+    name = os.path.basename((file_obj.file_name or '').replace('\\', '/'))
+    if name in ('', '.', '..'):
+        return file_obj.guid
+    return name
+
+
+def _month_range(start, end):
+    """
+    Return the ``(year, month)`` pairs from ``start`` through ``end``.
+
+    :param start: First month, as ``(year, month)`` or a date.
+    :type start: tuple
+    :param end: Last month, as ``(year, month)`` or a date.
+    :type end: tuple
+    """
+    if not start or not end:
+        raise Exception('No start/end month specified.')
+
+    def as_month(value):
+        if hasattr(value, 'year'):
+            return value.year, value.month
+        return tuple(value)
+
+    (year, month), last = as_month(start), as_month(end)
+    months = []
+    while (year, month) <= last:
+        months.append((year, month))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
+class SubmittableAPIError(Exception):
+    """
+    Raised for an unsuccessful API response, once any retries are used up.
+    ``status_code`` tells throttling (429) from other errors, and
+    ``retry_after`` holds the response's ``Retry-After`` header, if any.
+
+    :param message: Error message.
+    :type message: str
+    :param status_code: HTTP status code of the response.
+    :type status_code: int
+    :param uri: URI that was requested.
+    :type uri: str
+    :param retry_after: ``Retry-After`` header of the response.
+    :type retry_after: str
+    """
+    def __init__(self, message, status_code=None, uri=None,
+                 retry_after=None):
+        Exception.__init__(self, message)
+        self.status_code = status_code
+        self.uri = uri
+        self.retry_after = retry_after
+
+    @property
+    def throttled(self):
+        return self.status_code == 429
+
+
+class BufferedResponse(object):
+    """
+    A fully read HTTP response with the parts of the ``requests`` response
+    interface used by :class:`SubmittableAPIResponse`. Used for responses
+    served from a cache or read by the async client.
+
+    :param status_code: HTTP status code.
+    :type status_code: int
+    :param headers: Response headers.
+    :type headers: dict
+    :param content: Response body.
+    :type content: bytes
+    :param url: URI the response was requested from.
+    :type url: str
+    """
+    # Not sent over the network, unless set by the client.
+    elapsed = None
+    retries = 0
+    # Served from the revalidation store after a 304 Not Modified.
+    revalidated = False
+
+    def __init__(self, status_code, headers, content, url=None):
+        self.status_code = status_code
+        self.headers = CaseInsensitiveDict(headers)
+        self.content = content
+        self.url = url
+
+    def __bool__(self):
+        return self.ok
+    __nonzero__ = __bool__
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8')
+
+    def json(self):
+        return get_decoder()(self.content)
+
+    def iter_content(self, chunk_size=1):
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+
+    def close(self):
+        pass
+
+
+class _Flight(object):
+    """ A call in flight, shared by every caller asking for the same URI. """
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+    def wait(self):
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
 
 class SubmittableAPIClient(object):
     """
@@ -64,18 +371,410 @@ class SubmittableAPIClient(object):
     :type apitoken: str
     :param per_page: Per page item limit (defaults to 20)
     :type per_page: int
+    :param pool_connections: Number of host connection pools to cache.
+    :type pool_connections: int
+    :param pool_maxsize: Maximum number of kept-alive connections per host.
+    :type pool_maxsize: int
+    :param max_retries: Number of retries for failed connection attempts.
+    :type max_retries: int
+    :param keep_alive: Reuse connections between calls (defaults to True).
+    :type keep_alive: bool
+    :param pool_block: Block when all connections to a host are in use
+        instead of opening extra, unpooled connections.
+    :type pool_block: bool
+    :param rate_limit: Maximum requests started per second (unlimited by
+        default).
+    :type rate_limit: float
+    :param burst: Requests allowed back to back before ``rate_limit``
+        applies.
+    :type burst: int
+    :param max_concurrency: Enable adaptive concurrency, capping requests
+        in flight at this number and shrinking the cap while throttled.
+    :type max_concurrency: int
+    :param throttle_retries: Number of retries for 429 and 5xx responses.
+    :type throttle_retries: int
+    :param backoff_factor: Base delay in seconds between retries.
+    :type backoff_factor: float
+    :param max_backoff: Longest delay in seconds between retries. A
+        response whose ``Retry-After`` asks for longer is not retried.
+    :type max_backoff: float
+    :param cache: Response cache, e.g. :class:`cache.MemoryCache`.
+    :type cache: obj
+    :param cache_ttls: Seconds to cache each endpoint for, merged over
+        ``DEFAULT_CACHE_TTLS``.
+    :type cache_ttls: dict
+    :param revalidation_store: Cache used to remember responses and their
+        ``ETag``/``Last-Modified`` headers for conditional requests.
+    :type revalidation_store: obj
+    :param revalidation_ttl: Seconds to keep responses in the store.
+    :type revalidation_ttl: int
+    :param lazy: Build item objects only when they are accessed (see
+        :class:`SubmittableAPIResponse`).
+    :type lazy: bool
+    :param identity_map: Share one Category/Submitter object per ID across
+        every response from this client.
+    :type identity_map: :class:`IdentityMap`
+    :param json_decoder: JSON decoder for response bodies, see
+        :func:`decoders.get_decoder` (defaults to the fastest installed).
+    :type json_decoder: str
+    :param hooks: Functions called with a :class:`metrics.RequestEvent`
+        after every API call, e.g. :class:`metrics.MetricsCollector`.
+    :type hooks: list
+    :param transport: Sends requests instead of the client's Session, e.g.
+        :class:`transport.RecordingTransport`.
+    :type transport: obj
+    :param coalesce: Share one request between concurrent calls for the
+        same URI (defaults to True).
+    :type coalesce: bool
+
+    The client owns a ``requests.Session`` that every endpoint routes
+    through. Call :meth:`close` when finished, or use the client as a
+    context manager::
+
+        with SubmittableAPIClient(username='me', apitoken='555') as client:
+            client.categories()
 
     :returns: :class:`SubmittableAPIResponse` containing a list of
         content-specific objects and related metadata.
     """
 
-    def __init__(self, username=None, apitoken=None, per_page=20):
+    def __init__(self, username=None, apitoken=None, per_page=20,
+                 pool_connections=DEFAULT_POOL_CONNECTIONS,
+                 pool_maxsize=DEFAULT_POOL_MAXSIZE,
+                 max_retries=DEFAULT_MAX_RETRIES, keep_alive=True,
+                 pool_block=False, rate_limit=None, burst=None,
+                 max_concurrency=None,
+                 throttle_retries=DEFAULT_THROTTLE_RETRIES,
+                 backoff_factor=DEFAULT_BACKOFF_FACTOR,
+                 max_backoff=DEFAULT_MAX_BACKOFF, cache=None,
+                 cache_ttls=None, revalidation_store=None,
+                 revalidation_ttl=DEFAULT_REVALIDATION_TTL, lazy=False,
+                 identity_map=None, json_decoder=None, hooks=None,
+                 transport=None, coalesce=True):
         if not username or not apitoken:
             raise Exception('No username/apitoken credentials supplied.')
         self.username = username
         self.apitoken = apitoken
         self.per_page = per_page
         self.start_page = 1
+        self.session = self._build_session(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=max_retries,
+            keep_alive=keep_alive,
+            pool_block=pool_block,
+        )
+        self.rate_limiter = None
+        if rate_limit:
+            self.rate_limiter = RateLimiter(rate_limit, burst=burst)
+        self.concurrency_limiter = None
+        if max_concurrency:
+            self.concurrency_limiter = AdaptiveConcurrencyLimiter(
+                max_concurrency)
+        self.throttle_retries = throttle_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.cache = cache
+        self.cache_ttls = dict(DEFAULT_CACHE_TTLS, **(cache_ttls or {}))
+        self.revalidation_store = revalidation_store
+        self.revalidation_ttl = revalidation_ttl
+        self.not_modified = 0
+        self.lazy = lazy
+        self.identity_map = identity_map
+        self.decode_json = get_decoder(json_decoder)
+        self.hooks = list(hooks or ())
+        self.transport = transport
+        self.coalesce = coalesce
+        self.coalesced = 0
+        self._flights = {}
+        self._flights_lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _build_session(self, pool_connections, pool_maxsize, max_retries,
+                       keep_alive, pool_block):
+        """ Build the pooled Session shared by every endpoint. """
+        session = requests.Session()
+        session.auth = (self.username, self.apitoken)
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=max_retries,
+            pool_block=pool_block,
+        )
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        if not keep_alive:
+            session.headers['Connection'] = 'close'
+        return session
+
+    def _get(self, query_uri, endpoint=None, **kwargs):
+        """
+        Issue a GET request through the client's pooled Session, serving it
+        from the client's cache when the endpoint has a cache TTL.
+
+        :param query_uri: Fully qualified URI to request.
+        :type query_uri: str
+        :param endpoint: Name of the endpoint being requested.
+        :type endpoint: str
+
+        Additional keyword arguments (``headers``, ``stream``) are passed
+        through to ``requests``.
+
+        :returns: Response object from ``requests`` module.
+        """
+        # Credentials are part of the key so a shared on-disk cache never
+        # serves one account's data to another.
+        cache_key = "%s %s" % (self.username, query_uri)
+        ttl = None
+        if self.cache is not None:
+            ttl = self.cache_ttls.get(endpoint)
+        if ttl:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return BufferedResponse(*cached)
+
+        if self.revalidation_store is not None and not kwargs.get('stream'):
+            response = self._send_conditional(cache_key, query_uri, **kwargs)
+        else:
+            response = self._send(query_uri, **kwargs)
+
+        if ttl and response.status_code == 200:
+            self.cache.set(cache_key, (
+                response.status_code,
+                dict(response.headers),
+                response.content,
+            ), ttl)
+        return response
+
+    def _send_conditional(self, cache_key, query_uri, headers=None,
+                          **kwargs):
+        """
+        Send a conditional GET using the ``ETag``/``Last-Modified`` headers
+        stored for this URI. On a 304 the stored body is served instead.
+
+        :param cache_key: Key of the stored response.
+        :type cache_key: str
+        :param query_uri: Fully qualified URI to request.
+        :type query_uri: str
+
+        :returns: Response object from ``requests`` module.
+        """
+        headers = dict(headers or {})
+        stored = self.revalidation_store.get(cache_key)
+        if stored is not None:
+            stored_headers = CaseInsensitiveDict(stored[1])
+            if stored_headers.get('ETag'):
+                headers['If-None-Match'] = stored_headers['ETag']
+            if stored_headers.get('Last-Modified'):
+                headers['If-Modified-Since'] = stored_headers['Last-Modified']
+
+        response = self._send(query_uri, headers=headers, **kwargs)
+        if response.status_code == 304 and stored is not None:
+            self.not_modified += 1
+            buffered = BufferedResponse(*stored)
+            buffered.elapsed = response.elapsed
+            buffered.retries = response.retries
+            buffered.revalidated = True
+            return buffered
+
+        if response.status_code == 200 and (
+                response.headers.get('ETag') or
+                response.headers.get('Last-Modified')):
+            self.revalidation_store.set(cache_key, (
+                response.status_code,
+                dict(response.headers),
+                response.content,
+            ), self.revalidation_ttl)
+        return response
+
+    def _send(self, query_uri, **kwargs):
+        """
+        Send a GET request, waiting on the client's rate and concurrency
+        limits and retrying 429/5xx responses with backoff.
+
+        :param query_uri: Fully qualified URI to request.
+        :type query_uri: str
+
+        :returns: Response object from ``requests`` module.
+        """
+        attempt = 0
+        while True:
+            if self.rate_limiter:
+                self.rate_limiter.acquire()
+            if self.concurrency_limiter:
+                with self.concurrency_limiter:
+                    response = self._transmit(query_uri, **kwargs)
+                if response.status_code == 429:
+                    self.concurrency_limiter.record_throttle()
+                elif response.status_code not in RETRY_STATUSES:
+                    self.concurrency_limiter.record_success()
+            else:
+                response = self._transmit(query_uri, **kwargs)
+
+            if (response.status_code not in RETRY_STATUSES or
+                    attempt >= self.throttle_retries):
+                response.retries = attempt
+                return response
+
+            delay = retry_delay(
+                response, attempt, self.backoff_factor, self.max_backoff)
+            if delay is None:
+                logger.info("Not retrying %s: Retry-After %s exceeds "
+                            "max_backoff.", query_uri,
+                            response.headers.get('Retry-After'))
+                response.retries = attempt
+                return response
+            logger.info("Retrying %s after %s response in %.2fs.",
+                        query_uri, response.status_code, delay)
+            response.close()
+            time.sleep(delay)
+            attempt += 1
+
+    def _transmit(self, query_uri, **kwargs):
+        """ Send one GET request through the client's transport. """
+        if self.transport is None:
+            return self.session.get(query_uri, **kwargs)
+        return self.transport.send(self.session, query_uri, **kwargs)
+
+    def _response(self, response, obj_type, lazy=None):
+        """
+        Build a :class:`SubmittableAPIResponse` with the client's options.
+
+        :param response: Response object from ``requests`` module.
+        :type response: obj
+        :param obj_type: String keyword for type of object being requested.
+        :type obj_type: str
+        :param lazy: Override the client's ``lazy`` setting.
+        :type lazy: bool
+        """
+        if lazy is None:
+            lazy = self.lazy
+        return SubmittableAPIResponse(
+            response=response, obj_type=obj_type, lazy=lazy,
+            identity_map=self.identity_map, decoder=self.decode_json)
+
+    def close(self):
+        """ Release all pooled connections held by the client. """
+        self.session.close()
+
+    def call(self, name, lazy=None, **params):
+        """
+        Request any endpoint in ``ENDPOINTS`` by name. The endpoint methods
+        below validate their arguments and then call this; it can also be
+        used directly for endpoints registered with
+        :func:`register_endpoint`, such as ``organization`` and ``staff``.
+
+        :param name: Name of the endpoint.
+        :type name: str
+        :param lazy: Override the client's ``lazy`` setting for this call.
+        :type lazy: bool
+
+        Additional keyword arguments fill in the endpoint's URI template.
+
+        While ``coalesce`` is set, a call made while another thread is
+        already requesting the same URI waits for that request and returns
+        the same :class:`SubmittableAPIResponse`; ``coalesced`` counts these
+        calls.
+
+        :returns: :class:`SubmittableAPIResponse`
+        """
+        endpoint = ENDPOINTS.get(name)
+        if endpoint is None:
+            raise Exception('Endpoint not found: %s' % name)
+        query_uri = endpoint.uri(**params)
+        if not self.coalesce:
+            return self._call(name, query_uri, lazy)
+
+        key = (name, query_uri, self.lazy if lazy is None else lazy)
+        with self._flights_lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                self.coalesced += 1
+        if not leader:
+            logger.debug("Coalesced GET %s", query_uri)
+            return flight.wait()
+
+        try:
+            flight.result = self._call(name, query_uri, lazy)
+        except Exception as error:
+            flight.error = error
+            raise
+        finally:
+            with self._flights_lock:
+                del self._flights[key]
+            flight.done.set()
+        return flight.result
+
+    def _call(self, name, query_uri, lazy=None):
+        """ Request ``query_uri`` and build the response for ``name``. """
+        started = _clock()
+        response = self._get(query_uri, endpoint=name)
+        total = _clock() - started
+
+        result = None
+        try:
+            result = self._response(response, name, lazy=lazy)
+        finally:
+            # Failed responses raise while being built, but still count.
+            self._record(name, query_uri, response, total, result)
+        return result
+
+    def _record(self, endpoint, query_uri, response, total, result=None,
+                streamed=False):
+        """
+        Log a finished API call and pass its :class:`metrics.RequestEvent`
+        to the client's hooks.
+
+        :param endpoint: Name of the endpoint called.
+        :type endpoint: str
+        :param query_uri: Fully qualified URI requested.
+        :type query_uri: str
+        :param response: Response object from ``requests`` module.
+        :type response: obj
+        :param total: Seconds taken by the exchange, including retries.
+        :type total: float
+        :param result: Response built from ``response``, if any.
+        :type result: :class:`SubmittableAPIResponse`
+        :param streamed: The body of ``response`` has not been read.
+        :type streamed: bool
+        """
+        status_code = response.status_code
+        if getattr(response, 'revalidated', False):
+            # The API answered 304; the body came from the store.
+            status_code = 304
+            bytes_received = 0
+        elif streamed:
+            # The body has not been read yet.
+            bytes_received = int(response.headers.get('Content-Length', 0))
+        else:
+            bytes_received = len(response.content)
+        logger.debug("GET %s -> %s (%d bytes, %.3fs)", query_uri,
+                     status_code, bytes_received, total)
+        if not self.hooks:
+            return
+
+        elapsed = response.elapsed
+        event = RequestEvent(
+            endpoint, query_uri, status_code,
+            bytes_received=bytes_received,
+            ttfb=elapsed.total_seconds() if elapsed is not None else None,
+            total=total, retries=response.retries)
+        if result is not None:
+            event.decode = result.decode_time
+            event.provision = result.provision_time
+        for hook in self.hooks:
+            try:
+                hook(event)
+            except Exception:
+                logger.exception("Request hook %r failed.", hook)
 
     def categories(self):
         """
@@ -85,11 +784,7 @@ class SubmittableAPIClient(object):
             content-specific objects and related metadata.
         """
 
-        query_uri = "%s%s" % (BASE_API_URI, CATEGORIES_URI)
-        print query_uri
-        response = requests.get(query_uri, auth=(self.username, self.apitoken))
-
-        return SubmittableAPIResponse(response=response, obj_type='categories')
+        return self.call('categories')
 
     def category(self, cat_id=None):
         """
@@ -104,11 +799,7 @@ class SubmittableAPIClient(object):
         if not cat_id:
             raise Exception('No Category ID specified.')
 
-        query_uri = "%s%s%s" % (BASE_API_URI, CATEGORIES_URI, cat_id)
-        print query_uri
-        response = requests.get(query_uri, auth=(self.username, self.apitoken))
-
-        return SubmittableAPIResponse(response=response, obj_type='category')
+        return self.call('category', cat_id=cat_id)
 
     def category_form(self, cat_id=None):
         """
@@ -123,14 +814,10 @@ class SubmittableAPIClient(object):
         if not cat_id:
             raise Exception('No Category ID specified.')
 
-        query_uri = "%s%s%sform/" % (BASE_API_URI, CATEGORIES_URI, cat_id)
-        print query_uri
-        response = requests.get(query_uri, auth=(self.username, self.apitoken))
-
-        return SubmittableAPIResponse(
-            response=response, obj_type='category_form')
+        return self.call('category_form', cat_id=cat_id)
 
-    def category_submitters(self, cat_id=None, page=None, per_page=None):
+    def category_submitters(self, cat_id=None, page=None, per_page=None,
+                            lazy=None):
         """
         Returns user records that have submitted this form.
 
@@ -140,6 +827,8 @@ class SubmittableAPIClient(object):
         :type page: int
         :param per_page: Number of items per page to return.
         :type per_page: int
+        :param lazy: Override the client's ``lazy`` setting for this call.
+        :type lazy: bool
 
         :returns: :class:`SubmittableAPIResponse` containing a list of
             content-specific objects and related metadata.
@@ -149,22 +838,11 @@ class SubmittableAPIClient(object):
         per_page = per_page or self.per_page
         page = page or self.start_page
 
-        query_uri = "%s%s%ssubmitters/?page=%s&count=%s" % (
-            BASE_API_URI,
-            CATEGORIES_URI,
-            cat_id,
-            page,
-            per_page,
-        )
-        print query_uri
-        response = requests.get(query_uri, auth=(self.username, self.apitoken))
-
-        return SubmittableAPIResponse(
-            response=response, obj_type='category_submitters'
-        )
+        return self.call('category_submitters', lazy=lazy, cat_id=cat_id,
+                         page=page, count=per_page)
 
     def submissions(self, sort='submitted', direction='desc', page=1,
-                    per_page=20, status='inprogress'):
+                    per_page=20, status='inprogress', lazy=None):
         """
         Returns a list of Submissions. Allows pagination, sorting and filters.
 
@@ -178,6 +856,8 @@ class SubmittableAPIClient(object):
         :type per_page: int
         :param status: Keyword for Status value to filter against.
         :type status: str
+        :param lazy: Override the client's ``lazy`` setting for this call.
+        :type lazy: bool
 
         :returns: :class:`SubmittableAPIResponse` containing a list of
             content-specific objects and related metadata.
@@ -198,27 +878,15 @@ class SubmittableAPIClient(object):
             if val not in ALLOWED_STATUSES:
                 raise Exception('Status value not found: %s' % status)
 
-        if per_page > 200:
-            print """
-                Exceeded max per_page allowance per API restrictions.
-                Set per_page value to max of 200.
-                """
-            per_page = 200
-
-        status_qstring = ",".join(status_list)
-        query_uri = "%s%s?sort=%s&dir=%s&page=%s&count=%s&status=%s" % (
-            BASE_API_URI,
-            SUBMISSIONS_URI,
-            sort,
-            direction,
-            page,
-            per_page,
-            status_qstring,
-        )
-        print query_uri
-        response = requests.get(query_uri, auth=(self.username, self.apitoken))
+        if per_page > MAX_API_COUNT:
+            logger.warning(
+                "per_page %s exceeds the API maximum; using %s.",
+                per_page, MAX_API_COUNT)
+            per_page = MAX_API_COUNT
 
-        return SubmittableAPIResponse(response, 'submissions')
+        return self.call('submissions', lazy=lazy, sort=sort,
+                         direction=direction, page=page, count=per_page,
+                         status=",".join(status_list))
 
     def submission(self, sub_id=None):
         """
@@ -233,11 +901,7 @@ class SubmittableAPIClient(object):
         if not sub_id:
             raise Exception('No Submission ID specified.')
 
-        query_uri = "%s%s%s" % (BASE_API_URI, SUBMISSIONS_URI, sub_id)
-        print query_uri
-        response = requests.get(query_uri, auth=(self.username, self.apitoken))
-
-        return SubmittableAPIResponse(response=response, obj_type='submission')
+        return self.call('submission', sub_id=sub_id)
 
     def submission_labels(self, sub_id=None):
         """
@@ -252,12 +916,7 @@ class SubmittableAPIClient(object):
         if not sub_id:
             raise Exception('No Submission ID specified.')
 
-        query_uri = "%s%s%s/labels" % (BASE_API_URI, SUBMISSIONS_URI, sub_id)
-        print query_uri
-        response = requests.get(query_uri, auth=(self.username, self.apitoken))
-
-        return SubmittableAPIResponse(
-            response=response, obj_type='submission_labels')
+        return self.call('submission_labels', sub_id=sub_id)
 
     def submission_history(self, sub_id=None):
         """
@@ -272,14 +931,10 @@ class SubmittableAPIClient(object):
         if not sub_id:
             raise Exception('No Submission ID specified.')
 
-        query_uri = "%s%s%s/history" % (BASE_API_URI, SUBMISSIONS_URI, sub_id)
-        print query_uri
-        response = requests.get(query_uri, auth=(self.username, self.apitoken))
+        return self.call('submission_history', sub_id=sub_id)
 
-        return SubmittableAPIResponse(
-            response=response, obj_type='submission_history')
-
-    def submission_file(self, sub_id=None, file_guid=None):
+    def submission_file(self, sub_id=None, file_guid=None, stream=False,
+                        headers=None):
         """
         Returns a File attached to a single Submission.
 
@@ -287,23 +942,142 @@ class SubmittableAPIClient(object):
         :type sub_id: int
         :param file_guid: GUID for File object attached to Submission object.
         :type file_guid: str
+        :param stream: Defer downloading the body until it is read.
+        :type stream: bool
+        :param headers: Extra request headers, e.g. ``Range``.
+        :type headers: dict
 
-        :returns: :class:`SubmittableAPIResponse` containing a list of
-            content-specific objects and related metadata.
+        :returns: Response object from ``requests`` module.
         """
         if not sub_id:
             raise Exception('No Submission ID specified.')
         if not file_guid:
             raise Exception('No GUID specified.')
 
-        query_uri = "%s%s%s/file/%s" % (
-            BASE_API_URI,
-            SUBMISSIONS_URI,
-            sub_id,
-            file_guid
-        )
-        print query_uri
-        return requests.get(query_uri, auth=(self.username, self.apitoken))
+        query_uri = ENDPOINTS['submission_file'].uri(
+            sub_id=sub_id, file_guid=file_guid)
+        started = _clock()
+        response = self._get(
+            query_uri, endpoint='submission_file', stream=stream,
+            headers=headers)
+        self._record('submission_file', query_uri, response,
+                     _clock() - started, streamed=stream)
+        return response
+
+    def download_file(self, sub_id=None, file_obj=None, path=None,
+                      chunk_size=DOWNLOAD_CHUNK_SIZE, resume=True):
+        """
+        Stream a File attached to a Submission to disk without holding the
+        whole body in memory. A partial file left at ``path`` by an earlier
+        attempt is resumed with a Range request, and the finished file is
+        checked against ``File.file_size``. When the size is unknown, a file
+        the server reports as already complete (HTTP 416) is left as is.
+
+        :param sub_id: ID of Submission the File is attached to.
+        :type sub_id: int
+        :param file_obj: File object attached to the Submission.
+        :type file_obj: :class:`File`
+        :param path: Destination path (defaults to the base name of
+            ``File.file_name``).
+        :type path: str
+        :param chunk_size: Number of bytes written per chunk.
+        :type chunk_size: int
+        :param resume: Continue a partial download found at ``path``.
+        :type resume: bool
+
+        :returns: Path of the downloaded file.
+        """
+        if not file_obj:
+            raise Exception('No File specified.')
+        path = path or _download_name(file_obj)
+        expected_size = int(file_obj.file_size or 0) or None
+
+        existing_size = 0
+        if resume and os.path.exists(path):
+            existing_size = os.path.getsize(path)
+            if expected_size and existing_size == expected_size:
+                return path
+            if expected_size and existing_size > expected_size:
+                existing_size = 0
+
+        headers = None
+        if existing_size:
+            headers = {'Range': 'bytes=%s-' % existing_size}
+        response = self.submission_file(
+            sub_id=sub_id, file_guid=file_obj.guid, stream=True,
+            headers=headers)
+        if response.status_code == 416 and existing_size:
+            # Nothing lies past the end of the file at path, so it is already
+            # complete, unless the server reports a different total size.
+            response.close()
+            total = response.headers.get('Content-Range', '').rpartition(
+                '/')[2]
+            if not total.isdigit() or int(total) == existing_size:
+                response = None
+            else:
+                response = self.submission_file(
+                    sub_id=sub_id, file_guid=file_obj.guid, stream=True)
+        if response is not None:
+            self._write_download(response, file_obj, path, chunk_size)
+
+        if expected_size and os.path.getsize(path) != expected_size:
+            raise Exception(
+                'Downloaded size of %s does not match File.file_size: '
+                '%s != %s' % (path, os.path.getsize(path), expected_size))
+
+        return path
+
+    def _write_download(self, response, file_obj, path, chunk_size):
+        """ Write a streamed file response to ``path``, then close it. """
+        try:
+            if not response:
+                raise Exception(
+                    'Error downloading file %s: HTTP %s' % (
+                        file_obj.guid, response.status_code))
+            # A 200 means the server ignored the Range header and is
+            # sending the whole file, so start over.
+            mode = 'ab' if response.status_code == 206 else 'wb'
+            with open(path, mode) as outfile:
+                for chunk in response.iter_content(chunk_size):
+                    outfile.write(chunk)
+        finally:
+            response.close()
+
+    def download_files(self, files=None, directory='.',
+                       concurrency=DEFAULT_DOWNLOAD_CONCURRENCY,
+                       chunk_size=DOWNLOAD_CHUNK_SIZE, resume=True):
+        """
+        Stream many Files to ``directory`` in parallel. Each File is saved as
+        ``<sub_id>_<file_name>`` so that same-named attachments on different
+        Submissions do not collide.
+
+        :param files: Pairs of (Submission ID, :class:`File`).
+        :type files: iterable
+        :param directory: Directory to write the files to.
+        :type directory: str
+        :param concurrency: Number of files downloaded at once.
+        :type concurrency: int
+        :param chunk_size: Number of bytes written per chunk.
+        :type chunk_size: int
+        :param resume: Continue partial downloads found in ``directory``.
+        :type resume: bool
+
+        :returns: List of downloaded file paths.
+        """
+        if not files:
+            raise Exception('No Files specified.')
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        def download(task):
+            sub_id, file_obj = task
+            path = os.path.join(directory, "%s_%s" % (
+                sub_id, _download_name(file_obj)))
+            return self.download_file(
+                sub_id=sub_id, file_obj=file_obj, path=path,
+                chunk_size=chunk_size, resume=resume)
+
+        return list(_bounded_map(download, files, concurrency, ordered=False))
 
     def submission_form(self, sub_id=None):
         """
@@ -318,12 +1092,7 @@ class SubmittableAPIClient(object):
         if not sub_id:
             raise Exception('No Submission ID specified.')
 
-        query_uri = "%s%s%s/form" % (BASE_API_URI, SUBMISSIONS_URI, sub_id)
-        print query_uri
-        response = requests.get(query_uri, auth=(self.username, self.apitoken))
-
-        return SubmittableAPIResponse(
-            response=response, obj_type='submission_form')
+        return self.call('submission_form', sub_id=sub_id)
 
     def submission_assignments(self, sub_id=None):
         """
@@ -338,25 +1107,18 @@ class SubmittableAPIClient(object):
         if not sub_id:
             raise Exception('No Submission ID specified.')
 
-        query_uri = "%s%s%s/assignments" % (
-            BASE_API_URI,
-            SUBMISSIONS_URI,
-            sub_id
-        )
-        print query_uri
-        response = requests.get(query_uri, auth=(self.username, self.apitoken))
-
-        return SubmittableAPIResponse(
-            response=response, obj_type='submission_assignments')
+        return self.call('submission_assignments', sub_id=sub_id)
 
-    def payments(self, year=None, month=None):
+    def payments(self, year=None, month=None, lazy=None):
         """
-        Returns Assignments attached to a single Submission.
+        Returns Payments made in a given month.
 
         :param year: Year (YYYY) value to filter against.
         :type year: int
         :param month: Numeric month (MM) value to filter against.
         :type month: int
+        :param lazy: Override the client's ``lazy`` setting for this call.
+        :type lazy: bool
 
         :returns: :class:`SubmittableAPIResponse` containing a list of
             content-specific objects and related metadata.
@@ -366,13 +1128,9 @@ class SubmittableAPIClient(object):
         if not month:
             raise Exception('No Month specified.')
 
-        query_uri = "%s%s%s/%s" % (BASE_API_URI, PAYMENTS_URI, year, month)
-        print query_uri
-        response = requests.get(query_uri, auth=(self.username, self.apitoken))
-
-        return SubmittableAPIResponse(response=response, obj_type='payments')
+        return self.call('payments', lazy=lazy, year=year, month=month)
 
-    def submitters(self, page=1, per_page=20):
+    def submitters(self, page=1, per_page=20, lazy=None):
         """
         Returns Submitters for an Organization.
 
@@ -380,20 +1138,364 @@ class SubmittableAPIClient(object):
         :type page: int
         :param per_page: Number of items per page to return.
         :type per_page: int
+        :param lazy: Override the client's ``lazy`` setting for this call.
+        :type lazy: bool
 
         :returns: :class:`SubmittableAPIResponse` containing a list of
             content-specific objects and related metadata.
         """
-        query_uri = "%s%s?page=%s&count=%s" % (
-            BASE_API_URI,
-            SUBMITTERS_URI,
-            page,
-            per_page
-        )
-        print query_uri
-        response = requests.get(query_uri, auth=(self.username, self.apitoken))
+        return self.call('submitters', lazy=lazy, page=page, count=per_page)
+
+    def _iter_pages(self, fetch, page=None, concurrency=1, ordered=True,
+                    **kwargs):
+        """
+        Yield one :class:`SubmittableAPIResponse` per page of a paginated
+        endpoint, requesting ``MAX_API_COUNT`` items per page. Only the
+        current page is held in memory.
+
+        With a ``concurrency`` above 1 the first page is fetched to learn
+        ``total_pages`` and the remaining pages are then fetched in parallel,
+        holding at most ``concurrency`` pages in memory.
+
+        :param fetch: Bound client method accepting ``page``/``per_page``.
+        :type fetch: function
+        :param page: Page number to start on.
+        :type page: int
+        :param concurrency: Number of pages to fetch in parallel.
+        :type concurrency: int
+        :param ordered: Yield pages in page order (True) or in the order they
+            finish downloading (False).
+        :type ordered: bool
+        """
+        page = page or self.start_page
+        response = fetch(page=page, per_page=MAX_API_COUNT, **kwargs)
+        yield response
+        if not response.items or page >= response.total_pages:
+            return
+
+        if concurrency > 1:
+            def fetch_page(page):
+                return fetch(page=page, per_page=MAX_API_COUNT, **kwargs)
+
+            remaining = range(page + 1, response.total_pages + 1)
+            for response in _bounded_map(
+                    fetch_page, remaining, concurrency, ordered=ordered):
+                yield response
+            return
+
+        while page < response.total_pages and response.items:
+            page += 1
+            response = fetch(page=page, per_page=MAX_API_COUNT, **kwargs)
+            yield response
+
+    @staticmethod
+    def _iter_items(responses, raw=False):
+        """
+        Yield the items of each response in turn. Raw items are the
+        dictionaries decoded from the page; the response is built lazily,
+        so no item objects are created for them.
+        """
+        for response in responses:
+            if raw:
+                items = response.data.get('items', [])
+            else:
+                items = response.items
+            for item in items:
+                yield item
+
+    def iter_submissions(self, sort='submitted', direction='desc',
+                         status='inprogress', page=None, concurrency=1,
+                         ordered=True, raw=False):
+        """
+        Generator of Submissions across all pages. Accepts the same sorting
+        and filtering arguments as :meth:`submissions`.
+
+        :param sort: Keyword for attribute to sort against.
+        :type sort: str
+        :param direction: Keyword for direction of sort (asc or desc).
+        :type direction: str
+        :param status: Keyword for Status value to filter against.
+        :type status: str
+        :param page: Page number to start on.
+        :type page: int
+        :param concurrency: Number of pages to fetch in parallel.
+        :type concurrency: int
+        :param ordered: Yield in page order (True) or completion order.
+        :type ordered: bool
+        :param raw: Yield the item dictionaries decoded from each page
+            instead of item objects.
+        :type raw: bool
+
+        :returns: Generator of :class:`Submission` objects.
+        """
+        return self._iter_items(self._iter_pages(
+            self.submissions, page=page, concurrency=concurrency,
+            ordered=ordered, sort=sort, direction=direction, status=status,
+            lazy=raw or None), raw)
+
+    def iter_submitters(self, page=None, concurrency=1, ordered=True,
+                        raw=False):
+        """
+        Generator of Submitters for an Organization across all pages.
+
+        :param page: Page number to start on.
+        :type page: int
+        :param concurrency: Number of pages to fetch in parallel.
+        :type concurrency: int
+        :param ordered: Yield in page order (True) or completion order.
+        :type ordered: bool
+        :param raw: Yield the item dictionaries decoded from each page
+            instead of item objects.
+        :type raw: bool
+
+        :returns: Generator of :class:`Submitter` objects.
+        """
+        return self._iter_items(self._iter_pages(
+            self.submitters, page=page, concurrency=concurrency,
+            ordered=ordered, lazy=raw or None), raw)
+
+    def iter_category_submitters(self, cat_id=None, page=None, concurrency=1,
+                                 ordered=True, raw=False):
+        """
+        Generator of user records that have submitted to a Category, across
+        all pages.
+
+        :param cat_id: ID of Category
+        :type cat_id: int
+        :param page: Page number to start on.
+        :type page: int
+        :param concurrency: Number of pages to fetch in parallel.
+        :type concurrency: int
+        :param ordered: Yield in page order (True) or completion order.
+        :type ordered: bool
+        :param raw: Yield the item dictionaries decoded from each page
+            instead of item objects.
+        :type raw: bool
+
+        :returns: Generator of :class:`Submitter` objects.
+        """
+        if not cat_id:
+            raise Exception('No Category ID specified.')
+
+        return self._iter_items(self._iter_pages(
+            self.category_submitters, page=page, concurrency=concurrency,
+            ordered=ordered, cat_id=cat_id, lazy=raw or None), raw)
+
+    def payments_range(self, start=None, end=None,
+                       concurrency=DEFAULT_PAYMENT_CONCURRENCY, ordered=True,
+                       raw=False):
+        """
+        Generator of Payments for every month from ``start`` through ``end``.
+        Months are fetched in parallel.
+
+        :param start: First month, as ``(year, month)`` or a date.
+        :type start: tuple
+        :param end: Last month, as ``(year, month)`` or a date.
+        :type end: tuple
+        :param concurrency: Number of months fetched at once.
+        :type concurrency: int
+        :param ordered: Yield in month order (True) or completion order.
+        :type ordered: bool
+        :param raw: Yield the item dictionaries decoded from each page
+            instead of item objects.
+        :type raw: bool
+
+        :returns: Generator of :class:`Payment` objects.
+        """
+        def fetch_month(month):
+            return self.payments(
+                year=month[0], month=month[1], lazy=raw or None)
+
+        return self._iter_items(_bounded_map(
+            fetch_month, _month_range(start, end), concurrency,
+            ordered=ordered), raw)
 
-        return SubmittableAPIResponse(response=response, obj_type='submitters')
+    def payments_summary(self, start=None, end=None,
+                         concurrency=DEFAULT_PAYMENT_CONCURRENCY):
+        """
+        Total Payment amounts and fees for every month from ``start``
+        through ``end``, overall and by month, ``category_id`` and
+        refunded/settled state. Totals are computed from the JSON without
+        creating Payment objects.
+
+        :param start: First month, as ``(year, month)`` or a date.
+        :type start: tuple
+        :param end: Last month, as ``(year, month)`` or a date.
+        :type end: tuple
+        :param concurrency: Number of months fetched at once.
+        :type concurrency: int
+
+        :returns: :class:`columnar.PaymentSummary`
+        """
+        # Imported here because columnar imports this module.
+        from .columnar import PAYMENT_COLUMNS, PaymentSummary, build_columns
+
+        def fetch_month(month):
+            response = self.payments(
+                year=month[0], month=month[1], lazy=True)
+            return month, build_columns(
+                response.data.get('items', []), PAYMENT_COLUMNS)
+
+        summary = PaymentSummary()
+        for month, columns in _bounded_map(
+                fetch_month, _month_range(start, end), concurrency,
+                ordered=False):
+            summary.add(month, columns)
+        return summary
+
+    def submission_columns(self, sort='submitted', direction='desc',
+                           status='inprogress', concurrency=1, output=None):
+        """
+        Fetch every page of Submissions into columns (``submission_id``,
+        ``status``, ``date_created``, ``category_id``, ``user_id``,
+        ``amount``, ``fee``) built directly from the JSON, without creating
+        Submission objects.
+
+        :param sort: Keyword for attribute to sort against.
+        :type sort: str
+        :param direction: Keyword for direction of sort (asc or desc).
+        :type direction: str
+        :param status: Keyword for Status value to filter against.
+        :type status: str
+        :param concurrency: Number of pages to fetch in parallel.
+        :type concurrency: int
+        :param output: Column format, see
+            :func:`columnar.convert_columns`.
+        :type output: str
+
+        :returns: Columns in the requested format.
+        """
+        # Imported here because columnar imports this module.
+        from .columnar import (
+            SUBMISSION_COLUMNS, convert_columns, empty_columns,
+            extend_columns)
+
+        columns = empty_columns(SUBMISSION_COLUMNS)
+        for response in self._iter_pages(
+                self.submissions, concurrency=concurrency, sort=sort,
+                direction=direction, status=status, lazy=True):
+            extend_columns(
+                columns, SUBMISSION_COLUMNS, response.data.get('items', []))
+        return convert_columns(columns, output)
+
+    def fetch_submission_details(self, sub_ids=None, include=None,
+                                 concurrency=DEFAULT_DETAIL_CONCURRENCY):
+        """
+        Fetch the full record for many Submissions at once. Each requested
+        part of each Submission is a separate API call; the calls for all
+        IDs are issued concurrently. Repeated IDs are fetched only once.
+        A part that fails, e.g. for a deleted Submission, is left as None
+        and its error stored in the record's ``errors``; the rest of the
+        batch is still fetched.
+
+        :param sub_ids: IDs of Submission objects to retrieve.
+        :type sub_ids: list
+        :param include: Parts to fetch, any of ``submission``, ``labels``,
+            ``history``, ``form`` and ``assignments`` (defaults to all).
+        :type include: iterable
+        :param concurrency: Number of API calls in flight at once.
+        :type concurrency: int
+
+        :returns: :class:`SubmissionDetailBatch` mapping each Submission ID
+            to a :class:`SubmissionDetail`.
+        """
+        if not sub_ids:
+            raise Exception('No Submission IDs specified.')
+        methods = dict(SUBMISSION_DETAIL_PARTS)
+        include = include or methods.keys()
+        for part in include:
+            if part not in methods:
+                raise Exception('Detail part not found: %s' % part)
+
+        batch = SubmissionDetailBatch()
+        tasks = []
+        for sub_id in sub_ids:
+            if sub_id in batch:
+                batch.duplicates += 1
+                continue
+            batch[sub_id] = SubmissionDetail(sub_id)
+            for part, method in SUBMISSION_DETAIL_PARTS:
+                if part in include:
+                    tasks.append((sub_id, part, method))
+
+        def fetch_part(task):
+            sub_id, part, method = task
+            try:
+                return sub_id, part, getattr(self, method)(sub_id=sub_id), None
+            except Exception as error:
+                return sub_id, part, None, error
+
+        started = time.time()
+        for sub_id, part, response, error in _bounded_map(
+                fetch_part, tasks, concurrency, ordered=False):
+            batch.requests += 1
+            if error is not None:
+                logger.warning("Fetching %s of Submission %s failed: %s",
+                               part, sub_id, error)
+                batch[sub_id].errors[part] = error
+                batch.failures += 1
+            else:
+                batch[sub_id].add(part, response)
+        batch.elapsed = time.time() - started
+
+        return batch
+
+
+class SubmissionDetail(object):
+    """
+    The assembled record for a single Submission built by
+    :meth:`SubmittableAPIClient.fetch_submission_details`. Parts that were
+    not requested or failed are None; ``errors`` maps each failed part to
+    its exception.
+
+    :param submission_id: ID of the Submission.
+    :type submission_id: int
+    """
+    def __init__(self, submission_id):
+        self.submission_id = submission_id
+        self.submission = None
+        self.labels = None
+        self.history = None
+        self.form = None
+        self.assignments = None
+        self.errors = {}
+
+    def add(self, part, response):
+        """
+        Attach the response for one part of the record. The ``submission``
+        part is kept as the :class:`SubmittableAPIResponse`; the others are
+        stored as their list of item objects.
+        """
+        if part == 'submission':
+            self.submission = response
+        else:
+            setattr(self, part, response.items)
+
+
+class SubmissionDetailBatch(dict):
+    """
+    Mapping of Submission ID to :class:`SubmissionDetail` returned by
+    :meth:`SubmittableAPIClient.fetch_submission_details`, along with
+    throughput statistics for the batch. ``failures`` counts the calls that
+    raised.
+    """
+    def __init__(self):
+        super(SubmissionDetailBatch, self).__init__()
+        self.requests = 0
+        self.duplicates = 0
+        self.failures = 0
+        self.elapsed = 0.0
+
+    @property
+    def failed(self):
+        """ The records with at least one failed part. """
+        return [detail for detail in self.values() if detail.errors]
+
+    @property
+    def requests_per_second(self):
+        if not self.elapsed:
+            return 0.0
+        return self.requests / self.elapsed
 
 
 class SubmittableAPIResponse(object):
@@ -405,14 +1507,52 @@ class SubmittableAPIResponse(object):
     :type response: obj
     :param obj_type: String keyword for type of object being requested.
     :type obj_type: str
+    :param lazy: Build item objects only when they are accessed. ``items``
+        becomes a :class:`LazyItemList` and Submissions build their nested
+        objects on first attribute access.
+    :type lazy: bool
+    :param identity_map: Map used to share Category and Submitter objects.
+    :type identity_map: :class:`IdentityMap`
+    :param decoder: Function decoding the response body (defaults to the
+        fastest installed JSON decoder).
+    :type decoder: function
 
     :returns: None
     """
-
-    def __init__(self, response=None, obj_type=None):
+    # Fields only some endpoints return. They are class attributes so that a
+    # response only sets the fields its own endpoint provides; the mutable
+    # ones are created per response in __init__.
+    submission_id = 0
+    blind_level = 0
+    blind_value = 0
+    file_id = 0
+    time_created = None
+    title = 'UNTITLED'
+    start_date = None
+    expire_date = None
+    date_created = None
+    status = ''
+    form_url = ''
+    category_id = 0
+    assignments = None
+
+    def __init__(self, response=None, obj_type=None, lazy=False,
+                 identity_map=None, decoder=None):
+        if response is None:
+            raise SubmittableAPIError("Error in Response")
         if not response:
-            raise Exception("Error in Response")
-        self.data = response.json()
+            raise SubmittableAPIError(
+                "Error in Response: HTTP %s from %s" % (
+                    response.status_code, response.url),
+                status_code=response.status_code, uri=response.url,
+                retry_after=response.headers.get('Retry-After'))
+        self.obj_type = obj_type
+        self.lazy = lazy
+        self.identity_map = identity_map
+        started = _clock()
+        self.data = (decoder or get_decoder())(response.content)
+        decoded = _clock()
+        self.decode_time = decoded - started
         # Common fields returned by generally everything
         self.current_page = self.data.get('current_page', 0)
         self.total_pages = self.data.get('total_pages', 0)
@@ -422,57 +1562,67 @@ class SubmittableAPIResponse(object):
         self.items_per_page = self.data.get('items_per_page', 20)
         self.url = self.data.get('url', '')
         self.type = self.data.get('type', None)
-        self.submission_id = 0
         self.labels = {}
-        self.blind_level = 0
-        self.blind_value = 0
-        self.file_id = 0
-        self.time_created = None
         self.files = []
         self.votes = {}
         self.payment = {}
         self.submitter = {}
         self.category = {}
-        self.title = 'UNTITLED'
-        self.start_date = None
-        self.expire_date = None
-        self.date_created = None
-        self.status = ''
-        self.form_url = ''
-        self.category_id = 0
-        self.assignments = None
 
         # Initialize items listing
         self.items = []
 
-        if obj_type == 'category':
-            self.provision_category()
-        elif obj_type == 'categories':
-            self.provision_categories()
-        elif obj_type == 'category_form':
-            self.provision_category_form()
-        elif obj_type == 'category_submitters':
-            self.provision_category_submitters()
-        elif obj_type == 'submission':
-            self.provision_submission()
-        elif obj_type == 'submissions':
-            self.provision_submissions()
-        elif obj_type == 'submission_assignments':
-            self.provision_submission_assignments()
-        elif obj_type == 'submission_history':
-            self.provision_submission_history()
-        elif obj_type == 'submission_labels':
-            self.provision_submission_labels()
-        elif obj_type == 'submission_form':
-            self.provision_submission_form()
-        elif obj_type == 'payments':
-            self.provision_payments()
-        elif obj_type == 'submitters':
-            self.provision_submitters()
-        else:
+        endpoint = ENDPOINTS.get(obj_type)
+        if endpoint is None:
             raise Exception(
                 "Object type not recognized: %s" % obj_type
             )
+        endpoint.provision(self)
+        self.provision_time = _clock() - decoded
+
+    def to_columns(self, output=None):
+        """
+        Return this page of Submissions or Payments as columns built directly
+        from the JSON items.
+
+        :param output: Column format, see :func:`columnar.convert_columns`.
+        :type output: str
+
+        :returns: Columns in the requested format.
+        """
+        # Imported here because columnar imports this module.
+        from .columnar import COLUMNS_BY_TYPE, build_columns, convert_columns
+
+        spec = COLUMNS_BY_TYPE.get(self.obj_type)
+        if spec is None:
+            raise Exception(
+                "Columns not available for object type: %s" % self.obj_type)
+        return convert_columns(
+            build_columns(self.data.get('items', []), spec), output)
+
+    def _provision_items(self, item_class, lazy_class=None, refresh=False):
+        """
+        Build ``items`` from the response's item data, deferring object
+        construction when the response is lazy.
+
+        :param item_class: Class to build each item with.
+        :type item_class: class
+        :param lazy_class: Class to use instead in lazy mode.
+        :type lazy_class: class
+        :param refresh: Items are the authoritative copy of their entity and
+            replace the data held in the identity map.
+        :type refresh: bool
+        """
+        item_data = self.data.get('items', [])
+        if self.lazy and lazy_class:
+            item_class = lazy_class
+        build = item_class
+        if self.identity_map is not None:
+            build = self.identity_map.factory(item_class, refresh=refresh)
+        if self.lazy:
+            self.items = LazyItemList(item_data, build)
+        else:
+            self.items = [build(data) for data in item_data]
 
     def provision_category(self):
         """ Build Category-specific metadata and item objects. """
@@ -489,83 +1639,228 @@ class SubmittableAPIResponse(object):
         self.active = self.data.get('active', False)
         self.order = self.data.get('order', 0)
         self.formfields = FormFieldContainer(self.data.get('formfields', {}))
+        if self.identity_map is not None:
+            self.identity_map.category(self.data, refresh=True)
 
     def provision_category_form(self):
         """ Build category form objects. """
-        for data in self.data.get('items', []):
-            self.items.append(FormFieldItem(data))
+        ENDPOINTS['category_form'].provision(self)
 
     def provision_category_submitters(self):
         """ Build category form objects. """
-        for data in self.data.get('items', []):
-            self.items.append(Submitter(data))
+        ENDPOINTS['category_submitters'].provision(self)
 
     def provision_categories(self):
         """ Build Category-specific metadata and item objects. """
-        for data in self.data.get('items', []):
-            self.items.append(Category(data))
+        ENDPOINTS['categories'].provision(self)
 
     def provision_submission_assignments(self):
         """ Build Assignment-specific metadata and item objects. """
-        for data in self.data.get('items', []):
-            self.items.append(Assignment(data))
+        ENDPOINTS['submission_assignments'].provision(self)
 
     def provision_submission_form(self):
         """ Build submitted form-specific metadata and item objects. """
-        for data in self.data.get('items', []):
-            self.items.append(SubmittedFormField(data))
+        ENDPOINTS['submission_form'].provision(self)
 
     def provision_submission_history(self):
         """ Build submission history metadata and item objects. """
-        for data in self.data.get('items', []):
-            self.items.append(SubmissionHistory(data))
+        ENDPOINTS['submission_history'].provision(self)
 
     def provision_submission_labels(self):
         """ Build submission label metadata and item objects. """
-        for data in self.data.get('items', []):
-            self.items.append(SubmissionLabel(data))
+        ENDPOINTS['submission_labels'].provision(self)
 
     def provision_submission(self):
         """ Build Submission-specific metadata and item objects. """
         self.submission_id = self.data.get('submission_id', 0)
-        self.time_created = time.strptime(
-            self.data.get('date_created', "2014-05-21T11:58:57"),
-            "%Y-%m-%dT%H:%M:%S"
-        )
-        self.date_created = datetime.fromtimestamp(
-            time.mktime(self.time_created)
-        )
+        self.time_created, self.date_created = _parse_timestamp(
+            self.data.get('date_created', DEFAULT_TIMESTAMP))
         # TODO: find out if no data will cause a KeyError or
         # "falsy" value, then consider try/except KeyError.
         self.title = self.data.get('title', 'UNTITLED')
         self.file_id = self.data.get('file_id', 0)
         self.status = self.data.get('status', '')
         self.is_archived = self.data.get('is_archived', False)
-        self.category = Category(self.data.get('category', {}))
-        self.submitter = Submitter(self.data.get('submitter', {}))
-        self.payment = Payment(self.data.get('payment', {}))
+        self.category = _category(
+            self.data.get('category', {}), self.identity_map)
+        self.submitter = _submitter(
+            self.data.get('submitter', {}), self.identity_map)
+        self.payment = Payment(
+            self.data.get('payment', {}), identity_map=self.identity_map)
         self.votes = Votes(self.data.get('votes', {}))
         self.assignments = AssignmentsContainer(
             self.data.get('assignments', {}))
         self.labels = LabelsContainer(self.data.get('labels', {}))
         self.form = SubmittedFormContainer(self.data.get('form', {}))
-        for data in self.data.get('files'):
-            self.files.append(File(data))
+        self.files = [File(data) for data in self.data.get('files', [])]
 
     def provision_submissions(self):
         """ Build submission listing metadata and item objects. """
-        for data in self.data.get('items', []):
-            self.items.append(Submission(data))
+        ENDPOINTS['submissions'].provision(self)
 
     def provision_payments(self):
         """ Build Payment-specific metadata and item objects. """
-        for data in self.data.get('items', []):
-            self.items.append(Payment(data))
+        ENDPOINTS['payments'].provision(self)
 
     def provision_submitters(self):
         """ Build Submitter-specific metadata and item objects. """
-        for data in self.data.get('items', []):
-            self.items.append(Submitter(data))
+        ENDPOINTS['submitters'].provision(self)
+
+
+class IdentityMap(object):
+    """
+    Keeps one canonical :class:`Category` per ``category_id`` and one
+    :class:`Submitter` per ``user_id``, so that every response parsed with
+    the map shares the same objects and they can be compared by identity.
+
+    Copies embedded in Submissions and Payments are added when first seen,
+    and fill in any fields the canonical object is still missing, since
+    some embedded copies carry only the ID.
+    Responses from the ``category``, ``categories``, ``submitters`` and
+    ``category_submitters`` endpoints refresh the canonical object in place,
+    so every holder of it sees the newer data.
+    """
+    def __init__(self):
+        self.categories = {}
+        self.submitters = {}
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def category(self, data, refresh=False):
+        """
+        Return the canonical Category for ``data``.
+
+        :param data: Data dictionary in JSON format.
+        :type data: dict
+        :param refresh: Update the canonical object with ``data``.
+        :type refresh: bool
+        """
+        return self._intern(
+            self.categories, Category, data.get('category_id'), data, refresh)
+
+    def submitter(self, data, refresh=False):
+        """
+        Return the canonical Submitter for ``data``.
+
+        :param data: Data dictionary in JSON format.
+        :type data: dict
+        :param refresh: Update the canonical object with ``data``.
+        :type refresh: bool
+        """
+        return self._intern(
+            self.submitters, Submitter, data.get('user_id'), data, refresh)
+
+    def _intern(self, entries, item_class, key, data, refresh):
+        if not key:
+            return item_class(data)
+        with self.lock:
+            item = entries.get(key)
+            if item is None:
+                self.misses += 1
+                item = entries[key] = item_class(data)
+            else:
+                self.hits += 1
+                if refresh:
+                    item.__init__(data)
+                else:
+                    _fill_missing(item, data)
+            return item
+
+    def factory(self, item_class, refresh=False):
+        """
+        Return a callable building ``item_class`` objects through the map.
+
+        :param item_class: Item class being built.
+        :type item_class: class
+        :param refresh: Built items replace the canonical data.
+        :type refresh: bool
+        """
+        if issubclass(item_class, Category):
+            return partial(self.category, refresh=refresh)
+        if issubclass(item_class, Submitter):
+            return partial(self.submitter, refresh=refresh)
+        if issubclass(item_class, (Submission, Payment, SubmissionHistory)):
+            return partial(item_class, identity_map=self)
+        return item_class
+
+    def clear(self):
+        """ Forget every canonical object. """
+        with self.lock:
+            self.categories.clear()
+            self.submitters.clear()
+
+
+def _fill_missing(item, data):
+    """ Set the fields ``item`` has left empty that ``data`` provides. """
+    for name in item.__slots__:
+        value = data.get(name)
+        if value and not getattr(item, name):
+            setattr(item, name, value)
+
+
+def _category(data, identity_map):
+    """ Build a Category, through ``identity_map`` when there is one. """
+    if identity_map is None:
+        return Category(data)
+    return identity_map.category(data)
+
+
+def _submitter(data, identity_map):
+    """ Build a Submitter, through ``identity_map`` when there is one. """
+    if identity_map is None:
+        return Submitter(data)
+    return identity_map.submitter(data)
+
+
+class LazyItemList(object):
+    """
+    Read-only sequence of item objects that are built from their data
+    dictionaries the first time they are accessed.
+
+    :param data: List of item data dictionaries.
+    :type data: list
+    :param item_class: Class to build each item with.
+    :type item_class: class
+    """
+    def __init__(self, data, item_class):
+        self.data = data
+        self.item_class = item_class
+        self._items = [None] * len(data)
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        item = self._items[index]
+        if item is None:
+            item = self._items[index] = self.item_class(self.data[index])
+        return item
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+
+class _lazy_attribute(object):
+    """
+    Decorator for a method computing an attribute on first access. The
+    result is stored on the instance, so later reads are plain attribute
+    lookups.
+    """
+    def __init__(self, func):
+        self.func = func
+        self.__name__ = func.__name__
+        self.__doc__ = func.__doc__
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        value = self.func(instance)
+        instance.__dict__[self.__name__] = value
+        return value
 
 
 class Payment(object):
@@ -575,15 +1870,16 @@ class Payment(object):
     :param data: Data dictionary in JSON format.
     :type data: str
     """
-    def __init__(self, data):
+    __slots__ = (
+        'payment_id', 'time_created', 'payment_date', 'amount', 'fee',
+        'refunded', 'category_id', 'submission_id', 'description', 'settled',
+        'submitter',
+    )
+
+    def __init__(self, data, identity_map=None):
         self.payment_id = data.get('payment_id', 0)
-        self.time_created = time.strptime(
-            data.get('payment_date', "2014-05-21T11:58:57"),
-            "%Y-%m-%dT%H:%M:%S"
-        )
-        self.payment_date = datetime.fromtimestamp(
-            time.mktime(self.time_created)
-        )
+        self.time_created, self.payment_date = _parse_timestamp(
+            data.get('payment_date', DEFAULT_TIMESTAMP))
         self.amount = data.get('amount', 0.00)
         self.fee = data.get('fee', 0.00)
         self.refunded = data.get('refunded', False)
@@ -591,7 +1887,7 @@ class Payment(object):
         self.submission_id = data.get('submission_id', 0)
         self.description = data.get('description', '')
         self.settled = data.get('settled', False)
-        self.submitter = Submitter(data.get('submitter', {}))
+        self.submitter = _submitter(data.get('submitter', {}), identity_map)
 
 
 class Submission(object):
@@ -601,23 +1897,25 @@ class Submission(object):
     :param data: Data dictionary in JSON format.
     :type data: str
     """
-    def __init__(self, data):
+    __slots__ = (
+        'submission_id', 'time_created', 'date_created', 'title', 'file_id',
+        'status', 'is_archived', 'category', 'submitter', 'payment', 'votes',
+        'assignments', 'labels', 'form', 'files',
+    )
+
+    def __init__(self, data, identity_map=None):
         self.submission_id = data.get('submission_id', 0)
-        self.time_created = time.strptime(
-            data.get('date_created', "2014-05-21T11:58:57"),
-            "%Y-%m-%dT%H:%M:%S"
-        )
-        self.date_created = datetime.fromtimestamp(
-            time.mktime(self.time_created)
-        )
+        self.time_created, self.date_created = _parse_timestamp(
+            data.get('date_created', DEFAULT_TIMESTAMP))
         self.title = data.get('title', 'UNTITLED')
         self.file_id = data.get('file_id', 0)
         self.status = data.get('status', '')
         self.is_archived = data.get('is_archived', False)
-        self.category = Category(data.get('category', {}))
-        self.submitter = Submitter(data.get('submitter', {}))
+        self.category = _category(data.get('category', {}), identity_map)
+        self.submitter = _submitter(data.get('submitter', {}), identity_map)
         if data.get('payment'):
-            self.payment = Payment(data.get('payment', {}))
+            self.payment = Payment(
+                data.get('payment', {}), identity_map=identity_map)
         else:
             self.payment = None
         if data.get('votes'):
@@ -639,6 +1937,77 @@ class Submission(object):
             self.files.append(File(data))
 
 
+class LazySubmission(Submission):
+    """
+    A :class:`Submission` that only reads its scalar fields up front.
+    Dates and nested objects are built the first time they are accessed.
+
+    :param data: Data dictionary in JSON format.
+    :type data: str
+    """
+    def __init__(self, data, identity_map=None):
+        self._data = data
+        self._identity_map = identity_map
+        self.submission_id = data.get('submission_id', 0)
+        self.title = data.get('title', 'UNTITLED')
+        self.file_id = data.get('file_id', 0)
+        self.status = data.get('status', '')
+        self.is_archived = data.get('is_archived', False)
+
+    @_lazy_attribute
+    def time_created(self):
+        return _parse_timestamp(
+            self._data.get('date_created', DEFAULT_TIMESTAMP))[0]
+
+    @_lazy_attribute
+    def date_created(self):
+        return _parse_timestamp(
+            self._data.get('date_created', DEFAULT_TIMESTAMP))[1]
+
+    @_lazy_attribute
+    def category(self):
+        return _category(self._data.get('category', {}), self._identity_map)
+
+    @_lazy_attribute
+    def submitter(self):
+        return _submitter(
+            self._data.get('submitter', {}), self._identity_map)
+
+    @_lazy_attribute
+    def payment(self):
+        if self._data.get('payment'):
+            return Payment(
+                self._data.get('payment', {}),
+                identity_map=self._identity_map)
+        return None
+
+    @_lazy_attribute
+    def votes(self):
+        if self._data.get('votes'):
+            return Votes(self._data.get('votes', {}))
+        return None
+
+    @_lazy_attribute
+    def assignments(self):
+        if self._data.get('assignments'):
+            return AssignmentsContainer(self._data.get('assignments', {}))
+        return None
+
+    @_lazy_attribute
+    def labels(self):
+        if self._data.get('labels'):
+            return LabelsContainer(self._data.get('labels', {}))
+        return None
+
+    @_lazy_attribute
+    def form(self):
+        return SubmittedFormContainer(self._data.get('form', {}))
+
+    @_lazy_attribute
+    def files(self):
+        return [File(data) for data in self._data.get('files')]
+
+
 class File(object):
     """
     Representation of files container as a Python object.
@@ -646,6 +2015,10 @@ class File(object):
     :param data: Data dictionary in JSON format.
     :type data: str
     """
+    __slots__ = (
+        'guid', 'file_name', 'file_extension', 'file_size', 'mime_type', 'url',
+    )
+
     def __init__(self, data):
         self.guid = data.get('guid', '')
         self.file_name = data.get('file_name', '')
@@ -662,6 +2035,8 @@ class Votes(object):
     :param data: Data dictionary in JSON format.
     :type data: str
     """
+    __slots__ = ('count', 'score', 'average')
+
     def __init__(self, data):
         self.count = data.get('count', 0)
         self.score = data.get('score', 0)
@@ -675,6 +2050,8 @@ class SubmissionLabel(object):
     :param data: Data dictionary in JSON format.
     :type data: str
     """
+    __slots__ = ('label_text', 'label_color1', 'label_color2')
+
     def __init__(self, data):
         self.label_text = data.get('label_text', '')
         self.label_color1 = data.get('label_color1', '')
@@ -688,7 +2065,13 @@ class SubmissionHistory(object):
     :param data: Data dictionary in JSON format.
     :type data: str
     """
-    def __init__(self, data):
+    __slots__ = (
+        'submission_id', 'history_type', 'history_date', 'is_private',
+        'is_visible_to_submitter', 'email_message', 'note', 'description',
+        'replace_data', 'user',
+    )
+
+    def __init__(self, data, identity_map=None):
         self.submission_id = data.get('submission_id', 0)
         self.history_type = data.get('history_type', '')
         self.history_date = data.get('history_date', '2001-01-01')
@@ -699,7 +2082,7 @@ class SubmissionHistory(object):
         self.note = data.get('note', '')
         self.description = data.get('description', '')
         self.replace_data = data.get('replace_data', '')
-        self.user = Submitter(data.get('user', {}))
+        self.user = _submitter(data.get('user', {}), identity_map)
 
 
 class SubmittedFormContainer(object):
@@ -709,6 +2092,8 @@ class SubmittedFormContainer(object):
     :param data: Data dictionary in JSON format.
     :type data: str
     """
+    __slots__ = ('type', 'url', 'count', 'items')
+
     def __init__(self, data):
         self.type = data.get('type', '')
         self.url = data.get('url', '')
@@ -725,6 +2110,8 @@ class SubmittedFormField(object):
     :param data: Data dictionary in JSON format.
     :type data: str
     """
+    __slots__ = ('label', 'data', 'blind', 'order')
+
     def __init__(self, data):
         self.label = data.get('label', '')
         self.data = data.get('data', '')
@@ -739,6 +2126,8 @@ class Submitter(object):
     :param data: Data dictionary in JSON format.
     :type data: str
     """
+    __slots__ = ('user_id', 'first_name', 'last_name', 'email')
+
     def __init__(self, data):
         self.user_id = data.get('user_id', 0)
         self.first_name = data.get('first_name', '')
@@ -753,6 +2142,8 @@ class LabelsContainer(object):
     :param data: Data dictionary in JSON format.
     :type data: str
     """
+    __slots__ = ('type', 'url', 'count', 'items')
+
     def __init__(self, data):
         self.type = data.get('type', '')
         self.url = data.get('url', '')
@@ -769,6 +2160,8 @@ class AssignmentsContainer(object):
     :param data: Data dictionary in JSON format.
     :type data: str
     """
+    __slots__ = ('type', 'url', 'count', 'items')
+
     def __init__(self, data):
         self.type = data.get('type', '')
         self.url = data.get('url', '')
@@ -785,6 +2178,10 @@ class Assignment(object):
     :param data: Data dictionary in JSON format.
     :type data: str
     """
+    __slots__ = (
+        'user_id', 'staff_name', 'permission_level', 'permission_value',
+    )
+
     def __init__(self, data):
         self.user_id = data.get('user_id', 0)
         self.staff_name = data.get('staff_name', '')
@@ -799,6 +2196,8 @@ class FormFieldContainer(object):
     :param data: Data dictionary in JSON format.
     :type data: str
     """
+    __slots__ = ('type', 'url', 'count', 'items')
+
     def __init__(self, data):
         self.type = data.get('type', '')
         self.url = data.get('url', '')
@@ -815,6 +2214,8 @@ class FormFieldItem(object):
     :param data: Data dictionary in JSON format.
     :type data: str
     """
+    __slots__ = ('label', 'description', 'field_type', 'blind', 'order')
+
     def __init__(self, data):
         self.label = data.get('label', '')
         self.description = data.get('description', '')
@@ -830,6 +2231,12 @@ class Category(object):
     :param data: Data dictionary in JSON format.
     :type data: str
     """
+    __slots__ = (
+        'form_url', 'category_id', 'name', 'description', 'blind_level',
+        'blind_value', 'start_date', 'expire_date', 'active', 'order',
+        'formfields',
+    )
+
     def __init__(self, data):
         self.form_url = data.get('form_url', '')
         self.category_id = data.get('category_id', 0)
@@ -842,3 +2249,108 @@ class Category(object):
         self.active = data.get('active', False)
         self.order = data.get('order', 0)
         self.formfields = data.get('formfields', [])
+
+
+class Endpoint(object):
+    """
+    An API endpoint: the URI template its requests are built from and how
+    its responses are provisioned. Endpoints are looked up by name in
+    ``ENDPOINTS``, which is filled in once when this module is imported.
+
+    :param name: Endpoint name, also the response ``obj_type``.
+    :type name: str
+    :param uri_template: URI relative to ``BASE_API_URI``, with
+        ``str.format`` fields for the call's parameters.
+    :type uri_template: str
+    :param model: Class built for each item in the response, or None to
+        build no item objects.
+    :type model: class
+    :param lazy_model: Class used instead of ``model`` for lazy responses.
+    :type lazy_model: class
+    :param refresh: Items are the authoritative copy of their entity and
+        replace the data held in the identity map.
+    :type refresh: bool
+    :param provisioner: Function provisioning the
+        :class:`SubmittableAPIResponse` for endpoints that return a single
+        record rather than a list of items.
+    :type provisioner: function
+    """
+    __slots__ = (
+        'name', 'uri_template', 'format', 'model', 'lazy_model', 'refresh',
+        'provisioner',
+    )
+
+    def __init__(self, name, uri_template, model=None, lazy_model=None,
+                 refresh=False, provisioner=None):
+        self.name = name
+        self.uri_template = uri_template
+        self.format = uri_template.format
+        self.model = model
+        self.lazy_model = lazy_model
+        self.refresh = refresh
+        self.provisioner = provisioner
+
+    def uri(self, **params):
+        """ Return the fully qualified URI for a call with ``params``. """
+        return BASE_API_URI + self.format(**params)
+
+    def provision(self, response):
+        """ Build the metadata and item objects of ``response``. """
+        if self.provisioner is not None:
+            self.provisioner(response)
+        elif self.model is not None:
+            response._provision_items(
+                self.model, lazy_class=self.lazy_model, refresh=self.refresh)
+
+
+ENDPOINTS = {}
+
+
+def register_endpoint(endpoint):
+    """
+    Add an :class:`Endpoint` to ``ENDPOINTS``, replacing any endpoint of the
+    same name, so that it can be called with
+    :meth:`SubmittableAPIClient.call`.
+
+    :param endpoint: The endpoint to register.
+    :type endpoint: :class:`Endpoint`
+    """
+    ENDPOINTS[endpoint.name] = endpoint
+    return endpoint
+
+
+for _endpoint in (
+    Endpoint('categories', CATEGORIES_URI, Category, refresh=True),
+    Endpoint('category', CATEGORIES_URI + '{cat_id}', Category,
+             provisioner=SubmittableAPIResponse.provision_category),
+    Endpoint('category_form', CATEGORIES_URI + '{cat_id}/form/',
+             FormFieldItem),
+    Endpoint('category_submitters',
+             CATEGORIES_URI + '{cat_id}/submitters/?page={page}&count={count}',
+             Submitter, refresh=True),
+    Endpoint('submissions',
+             SUBMISSIONS_URI + '?sort={sort}&dir={direction}&page={page}'
+             '&count={count}&status={status}',
+             Submission, lazy_model=LazySubmission),
+    Endpoint('submission', SUBMISSIONS_URI + '{sub_id}', Submission,
+             provisioner=SubmittableAPIResponse.provision_submission),
+    Endpoint('submission_labels', SUBMISSIONS_URI + '{sub_id}/labels',
+             SubmissionLabel),
+    Endpoint('submission_history', SUBMISSIONS_URI + '{sub_id}/history',
+             SubmissionHistory),
+    Endpoint('submission_file',
+             SUBMISSIONS_URI + '{sub_id}/file/{file_guid}'),
+    Endpoint('submission_form', SUBMISSIONS_URI + '{sub_id}/form',
+             SubmittedFormField),
+    Endpoint('submission_assignments',
+             SUBMISSIONS_URI + '{sub_id}/assignments', Assignment),
+    Endpoint('payments', PAYMENTS_URI + '{year}/{month}', Payment),
+    Endpoint('submitters', SUBMITTERS_URI + '?page={page}&count={count}',
+             Submitter, refresh=True),
+    # Not wrapped by client methods yet; their data is available through
+    # SubmittableAPIClient.call and the response's ``data``.
+    Endpoint('organization', ORGANIZATION_URI),
+    Endpoint('staff', STAFF_URI),
+):
+    register_endpoint(_endpoint)
+del _endpoint
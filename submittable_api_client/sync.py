@@ -0,0 +1,146 @@
+"""
+Incremental synchronization of Submissions. Instead of re-reading every
+page on each run, :class:`SubmissionSync` remembers the newest Submission it
+has seen (its high-water mark) and the last known status of each
+Submission, and stops paging as soon as it reaches records it has already
+seen.
+
+.. moduleauthor:: Shawn Rider <shawn@shawnrider.com>
+
+"""
+from datetime import datetime
+import json
+import logging
+import os
+
+from .submittable_api_client import (
+    MAX_API_COUNT, TIMESTAMP_FORMAT, _replace,
+)
+
+__all__ = ('SubmissionSync',)
+
+logger = logging.getLogger(__name__)
+
+
+class SubmissionSync(object):
+    """
+    Finds Submissions that are new or have changed status since the last
+    sync. State is kept in a JSON file at ``state_path`` between runs.
+
+    Submissions are read newest first. Paging stops after the page that
+    reaches the high-water mark, so a status change on an older Submission
+    is only noticed when it appears on a page that is read; run
+    ``sync(full=True)`` periodically to check the whole archive.
+
+    Keep ``status`` as ``'all'`` to catch every status change. With a
+    narrower filter, e.g. ``'inprogress'``, a Submission that moves to
+    another status drops out of the listing instead of being reported as
+    changed; only ``sync(full=True)`` notices it, by listing its ID in
+    ``departed``.
+
+    :param client: Client used to make API calls.
+    :type client: :class:`SubmittableAPIClient`
+    :param state_path: Path of the JSON file holding sync state.
+    :type state_path: str
+    :param status: Keyword for Status value to filter against.
+    :type status: str
+    :param per_page: Number of items per page to request.
+    :type per_page: int
+    """
+    def __init__(self, client=None, state_path=None, status='all',
+                 per_page=MAX_API_COUNT):
+        if not client:
+            raise Exception('No client specified.')
+        if not state_path:
+            raise Exception('No state path specified.')
+        self.client = client
+        self.state_path = state_path
+        self.status = status
+        self.per_page = per_page
+        self.high_water_mark = None
+        self.statuses = {}
+        self.departed = []
+        if status != 'all':
+            logger.warning(
+                "Syncing Submissions with status %r: those that move to "
+                "another status are only noticed by a full sync.", status)
+        self.load()
+
+    def load(self):
+        """ Read sync state from ``state_path`` if it exists. """
+        if not os.path.exists(self.state_path):
+            return
+        with open(self.state_path) as state_file:
+            state = json.load(state_file)
+        mark = state.get('high_water_mark')
+        if mark:
+            self.high_water_mark = (
+                datetime.strptime(mark['date_created'], TIMESTAMP_FORMAT),
+                mark['submission_id'],
+            )
+        self.statuses = state.get('statuses', {})
+
+    def save(self):
+        """ Write sync state to ``state_path``. """
+        mark = None
+        if self.high_water_mark:
+            date_created, submission_id = self.high_water_mark
+            mark = {
+                'date_created': date_created.strftime(TIMESTAMP_FORMAT),
+                'submission_id': submission_id,
+            }
+        temp_path = "%s.tmp" % self.state_path
+        with open(temp_path, 'w') as state_file:
+            json.dump({
+                'high_water_mark': mark,
+                'statuses': self.statuses,
+            }, state_file)
+        _replace(temp_path, self.state_path)
+
+    def sync(self, full=False):
+        """
+        Return the Submissions that are new or whose status changed since the
+        last sync, and save the new state. A full sync also sets
+        ``departed`` to the IDs of Submissions no longer listed, e.g. those
+        that have left the ``status`` filter, and stops tracking them.
+
+        :param full: Read every page instead of stopping at the high-water
+            mark.
+        :type full: bool
+
+        :returns: List of :class:`Submission` objects.
+        """
+        mark = None if full else self.high_water_mark
+        newest = self.high_water_mark
+        changed = []
+        seen = set()
+        page = 1
+        while True:
+            response = self.client.submissions(
+                sort='submitted', direction='desc', page=page,
+                per_page=self.per_page, status=self.status)
+            reached_mark = False
+            for submission in response.items:
+                key = (submission.date_created, submission.submission_id)
+                if mark is not None and key <= mark:
+                    reached_mark = True
+                sub_id = str(submission.submission_id)
+                seen.add(sub_id)
+                if self.statuses.get(sub_id) != submission.status:
+                    changed.append(submission)
+                    self.statuses[sub_id] = submission.status
+                if newest is None or key > newest:
+                    newest = key
+            if (reached_mark or not response.items or
+                    page >= response.total_pages):
+                break
+            page += 1
+
+        if full:
+            self.departed = [sub_id for sub_id in self.statuses
+                             if sub_id not in seen]
+            for sub_id in self.departed:
+                del self.statuses[sub_id]
+        self.high_water_mark = newest
+        self.save()
+        return changed
@@ -0,0 +1,146 @@
+"""
+Client-side throttling helpers used by :class:`SubmittableAPIClient` to stay
+under the Submittable.com API rate limits when making many calls.
+
+.. moduleauthor:: Shawn Rider <shawn@shawnrider.com>
+
+"""
+from email.utils import mktime_tz, parsedate_tz
+import random
+import threading
+import time
+
+__all__ = ('AdaptiveConcurrencyLimiter', 'RateLimiter', 'retry_delay')
+
+# time.monotonic is not available on Python 2.
+_clock = getattr(time, 'monotonic', time.time)
+
+
+class RateLimiter(object):
+    """
+    Token bucket limiting how many requests may start per second. Up to
+    ``burst`` requests can start back to back before the limit applies.
+
+    :param rate: Sustained number of requests per second.
+    :type rate: float
+    :param burst: Bucket capacity (defaults to ``rate``, minimum 1).
+    :type burst: int
+    """
+    def __init__(self, rate, burst=None):
+        if not rate or rate <= 0:
+            raise Exception('Rate must be a positive number.')
+        self.rate = float(rate)
+        self.burst = max(burst or int(self.rate), 1)
+        self.tokens = float(self.burst)
+        self.updated = _clock()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """ Block until a request may start. """
+        while True:
+            with self.lock:
+                now = _clock()
+                self.tokens = min(
+                    self.burst,
+                    self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class AdaptiveConcurrencyLimiter(object):
+    """
+    Caps the number of requests in flight, halving the cap when the API
+    throttles and growing it back by one after ``increase_after`` successful
+    requests in a row.
+
+    :param max_concurrency: Upper bound on requests in flight.
+    :type max_concurrency: int
+    :param min_concurrency: Lower bound the cap can shrink to.
+    :type min_concurrency: int
+    :param increase_after: Successes needed before the cap grows by one.
+    :type increase_after: int
+    """
+    def __init__(self, max_concurrency, min_concurrency=1, increase_after=10):
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.increase_after = increase_after
+        self.limit = max_concurrency
+        self.in_flight = 0
+        self.successes = 0
+        self.condition = threading.Condition()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+
+    def acquire(self):
+        """ Block until the number of requests in flight is under the cap. """
+        with self.condition:
+            while self.in_flight >= self.limit:
+                self.condition.wait()
+            self.in_flight += 1
+
+    def release(self):
+        """ Mark a request as finished. """
+        with self.condition:
+            self.in_flight -= 1
+            self.condition.notify()
+
+    def record_success(self):
+        """ Count a successful request, growing the cap when due. """
+        with self.condition:
+            self.successes += 1
+            if (self.successes >= self.increase_after and
+                    self.limit < self.max_concurrency):
+                self.limit += 1
+                self.successes = 0
+                self.condition.notify()
+
+    def record_throttle(self):
+        """ Halve the cap after the API throttled a request. """
+        with self.condition:
+            self.limit = max(self.min_concurrency, self.limit // 2)
+            self.successes = 0
+
+
+def retry_delay(response, attempt, backoff_factor, max_backoff):
+    """
+    Number of seconds to wait before retrying a throttled or failed request.
+    A ``Retry-After`` header (seconds or HTTP date) is honored; otherwise the
+    delay grows exponentially with ``attempt``. Random jitter is added so
+    that parallel workers do not retry in lockstep.
+
+    Returns None when ``Retry-After`` asks for a longer wait than
+    ``max_backoff``, as retrying any sooner would only be throttled again.
+
+    :param response: Response object from ``requests`` module.
+    :type response: obj
+    :param attempt: Number of retries already made (starting at 0).
+    :type attempt: int
+    :param backoff_factor: Base delay in seconds.
+    :type backoff_factor: float
+    :param max_backoff: Upper bound on the delay in seconds.
+    :type max_backoff: float
+
+    :returns: float
+    """
+    retry_after = response.headers.get('Retry-After')
+    if retry_after:
+        try:
+            delay = float(retry_after)
+        except ValueError:
+            parsed = parsedate_tz(retry_after)
+            delay = mktime_tz(parsed) - time.time() if parsed else 0
+        if delay > max_backoff:
+            return None
+        if delay > 0:
+            return delay + random.uniform(0, backoff_factor)
+
+    return random.uniform(0, min(max_backoff, backoff_factor * 2 ** attempt))
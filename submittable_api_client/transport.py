@@ -0,0 +1,176 @@
+"""
+Transports for :class:`SubmittableAPIClient`. A transport sends each GET
+request the client makes; by default the client's own ``requests`` Session
+is used. :class:`RecordingTransport` stores every response in a
+:class:`ResponseArchive`, and :class:`ReplayTransport` serves them back
+from the archive without touching the network, so processing jobs can be
+rerun offline over the same API output.
+
+A transport is any object with a ``send(session, uri, **kwargs)`` method
+returning a response.
+
+.. moduleauthor:: Shawn Rider <shawn@shawnrider.com>
+
+"""
+import json
+import sqlite3
+import threading
+import time
+import zlib
+
+from .submittable_api_client import BufferedResponse
+
+__all__ = ('RecordingTransport', 'ReplayTransport', 'ResponseArchive')
+
+
+def _archive_key(uri, headers=None):
+    """ Key a request by its URI and any Range it asked for. """
+    range_header = (headers or {}).get('Range')
+    if range_header:
+        return "%s Range=%s" % (uri, range_header)
+    return uri
+
+
+class ResponseArchive(object):
+    """
+    Recorded responses kept in a SQLite database. Bodies are compressed
+    with zlib.
+
+    :param path: Path of the SQLite database file.
+    :type path: str
+    :param level: zlib compression level.
+    :type level: int
+    """
+    def __init__(self, path, level=6):
+        self.path = path
+        self.level = level
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, status_code INTEGER, headers TEXT, "
+            "body BLOB, recorded REAL)")
+        self.connection.commit()
+
+    def __len__(self):
+        with self.lock:
+            return self.connection.execute(
+                "SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def store(self, key, status_code, headers, body):
+        """ Record the response for ``key``, replacing any earlier one. """
+        with self.lock:
+            self.connection.execute(
+                "REPLACE INTO responses "
+                "(key, status_code, headers, body, recorded) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, status_code, json.dumps(dict(headers)),
+                 sqlite3.Binary(zlib.compress(body, self.level)),
+                 time.time()))
+            self.connection.commit()
+
+    def load(self, key):
+        """
+        Return ``(status_code, headers, body)`` recorded for ``key``, or
+        None.
+        """
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT status_code, headers, body FROM responses "
+                "WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        return self._entry(row)
+
+    def entries(self):
+        """ Yield ``(key, (status_code, headers, body))`` for every record. """
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT key, status_code, headers, body FROM responses"
+            ).fetchall()
+        for row in rows:
+            yield row[0], self._entry(row[1:])
+
+    def _entry(self, row):
+        status_code, headers, body = row
+        return status_code, json.loads(headers), zlib.decompress(bytes(body))
+
+    def close(self):
+        """ Close the database connection. """
+        self.connection.close()
+
+
+class RecordingTransport(object):
+    """
+    Sends requests as usual and records every response in ``archive``.
+    Streamed bodies are read in full so they can be recorded.
+
+    A ``304 Not Modified`` answer to a conditional request has no body, so
+    it is not recorded; the response recorded earlier for the URI is kept
+    and replayed instead. With a ``revalidation_store`` that outlives the
+    archive, start recording with an empty store so every URI is recorded
+    with its body at least once.
+
+    :param archive: Archive to record responses in.
+    :type archive: :class:`ResponseArchive`
+    :param transport: Transport to send requests with (defaults to the
+        client's Session).
+    :type transport: obj
+    """
+    def __init__(self, archive, transport=None):
+        self.archive = archive
+        self.transport = transport
+        self.recorded = 0
+        self.not_modified = 0
+
+    def send(self, session, uri, **kwargs):
+        if self.transport is None:
+            response = session.get(uri, **kwargs)
+        else:
+            response = self.transport.send(session, uri, **kwargs)
+        if response.status_code == 304:
+            self.not_modified += 1
+            return response
+        self.archive.store(
+            _archive_key(uri, kwargs.get('headers')),
+            response.status_code, response.headers, response.content)
+        self.recorded += 1
+        return response
+
+
+class ReplayTransport(object):
+    """
+    Serves responses recorded by :class:`RecordingTransport` without
+    sending any requests. With ``preload`` the whole archive is read into
+    memory up front.
+
+    :param archive: Archive to serve responses from.
+    :type archive: :class:`ResponseArchive`
+    :param preload: Read every recorded response into memory at once.
+    :type preload: bool
+    :param strict: Raise for requests that were not recorded; otherwise
+        answer them with a 404 response.
+    :type strict: bool
+    """
+    def __init__(self, archive, preload=True, strict=True):
+        self.archive = archive
+        self.strict = strict
+        self.entries = {}
+        if preload:
+            self.entries = dict(archive.entries())
+        self.replayed = 0
+        self.missing = 0
+
+    def send(self, session, uri, **kwargs):
+        key = _archive_key(uri, kwargs.get('headers'))
+        entry = self.entries.get(key)
+        if entry is None:
+            entry = self.archive.load(key)
+            if entry is None:
+                self.missing += 1
+                if self.strict:
+                    raise Exception('No recorded response for: %s' % key)
+                return BufferedResponse(404, {}, b'', url=uri)
+            self.entries[key] = entry
+        self.replayed += 1
+        return BufferedResponse(*entry, url=uri)
@@ -0,0 +1,161 @@
+"""
+Streaming writers for raw item dictionaries, such as those yielded by the
+client's ``iter_`` methods with ``raw=True``. Items are written one at a
+time, so memory use does not grow with the size of the archive.
+
+.. moduleauthor:: Shawn Rider <shawn@shawnrider.com>
+
+"""
+from collections import OrderedDict
+import csv
+from itertools import chain, islice
+import json
+import logging
+
+__all__ = ('flatten_item', 'form_columns', 'write_csv', 'write_ndjson')
+
+logger = logging.getLogger(__name__)
+
+# Number of items read ahead to choose the CSV columns.
+DEFAULT_CSV_SAMPLE = 200
+
+try:
+    _text = unicode
+except NameError:  # Python 3
+    _text = None
+
+
+def _csv_value(value):
+    # The Python 2 csv module writes bytes only.
+    if _text is not None and isinstance(value, _text):
+        return value.encode('utf-8')
+    return value
+
+
+def write_ndjson(items, file_obj):
+    """
+    Write each item as one line of JSON.
+
+    :param items: Item dictionaries.
+    :type items: iterable
+    :param file_obj: Text file to write to.
+    :type file_obj: file
+
+    :returns: Number of items written.
+    """
+    count = 0
+    for item in items:
+        file_obj.write(json.dumps(item))
+        file_obj.write('\n')
+        count += 1
+    return count
+
+
+def flatten_item(item, prefix=''):
+    """
+    Flatten an item dictionary into one level. Nested dictionaries become
+    dotted keys (``category.name``), the answers of a submitted ``form``
+    become one ``form.<label>`` key per question, and other lists are kept
+    as JSON.
+
+    :param item: Item dictionary.
+    :type item: dict
+    :param prefix: Prefix for every key.
+    :type prefix: str
+
+    :returns: OrderedDict
+    """
+    flat = OrderedDict()
+    for key, value in item.items():
+        name = prefix + key
+        if key == 'form' and isinstance(value, dict):
+            for field in value.get('items') or []:
+                flat['%s.%s' % (name, field.get('label', ''))] = (
+                    field.get('data'))
+        elif isinstance(value, dict):
+            flat.update(flatten_item(value, name + '.'))
+        elif isinstance(value, list):
+            flat[name] = json.dumps(value)
+        else:
+            flat[name] = value
+    return flat
+
+
+def form_columns(client, cat_ids):
+    """
+    Column names for the answers to the forms of the given Categories, in
+    form order, for the ``fields`` of :func:`write_csv`. Use them when the
+    items span several Categories, whose forms ask different questions.
+
+    :param client: Client used to fetch each Category's form.
+    :type client: :class:`SubmittableAPIClient`
+    :param cat_ids: IDs of the Categories.
+    :type cat_ids: iterable
+
+    :returns: list
+    """
+    columns = []
+    for cat_id in cat_ids:
+        for field in client.category_form(cat_id).items:
+            name = 'form.%s' % field.label
+            if name not in columns:
+                columns.append(name)
+    return columns
+
+
+def write_csv(items, file_obj, fields=None, sample=DEFAULT_CSV_SAMPLE,
+              dropped=None):
+    """
+    Write items as CSV rows, flattened with :func:`flatten_item`.
+
+    Unless ``fields`` is given, the columns are every key found in the
+    first ``sample`` items. Keys that are not columns, such as the answers
+    to a form first seen after the sample, are not written; a warning is
+    logged for each, and ``dropped`` counts the rows that had them.
+
+    :param items: Item dictionaries.
+    :type items: iterable
+    :param file_obj: File to write to, opened with ``newline=''`` (binary
+        mode on Python 2).
+    :type file_obj: file
+    :param fields: Column names, in order.
+    :type fields: list
+    :param sample: Number of items read ahead to choose the columns.
+    :type sample: int
+    :param dropped: Dictionary updated with the number of rows each key
+        that was not written appeared in.
+    :type dropped: dict
+
+    :returns: Number of items written.
+    """
+    rows = (flatten_item(item) for item in items)
+    if fields is None:
+        head = list(islice(rows, sample))
+        fields = []
+        seen = set()
+        for row in head:
+            for name in row:
+                if name not in seen:
+                    seen.add(name)
+                    fields.append(name)
+        rows = chain(head, rows)
+
+    if dropped is None:
+        dropped = {}
+    columns = set(fields)
+    writer = csv.writer(file_obj)
+    writer.writerow([_csv_value(name) for name in fields])
+    count = 0
+    for row in rows:
+        writer.writerow([_csv_value(row.get(name)) for name in fields])
+        count += 1
+        if not columns.issuperset(row):
+            for name in row:
+                if name in columns:
+                    continue
+                if name not in dropped:
+                    logger.warning("CSV column %r first seen in row %d is "
+                                   "not written.", name, count)
+                    dropped[name] = 0
+                dropped[name] += 1
+    return count